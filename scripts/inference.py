@@ -4,12 +4,14 @@ import argparse
 import time
 from pathlib import Path
 
-import librosa
+import soundfile as sf
+import soxr
 import torch
 from transformers import WhisperProcessor
 
 from finetune_whisper.models.lora_whisper import load_lora_whisper
 from finetune_whisper.utils.device import get_device
+from finetune_whisper.utils.features import extract_features
 
 
 def load_audio(audio_path: str, sampling_rate: int = 16000):
@@ -26,11 +28,15 @@ def load_audio(audio_path: str, sampling_rate: int = 16000):
     print(f"Loading audio from: {audio_path}")
 
     # Load audio
-    audio, sr = librosa.load(audio_path, sr=sampling_rate)
+    audio, sr = sf.read(audio_path, dtype="float32", always_2d=False)
 
-    # Convert to mono if stereo
+    # Convert to mono if stereo (soundfile returns (frames, channels))
     if audio.ndim > 1:
-        audio = audio.mean(axis=0)
+        audio = audio.mean(axis=1)
+
+    # Resample if necessary
+    if sr != sampling_rate:
+        audio = soxr.resample(audio, sr, sampling_rate, quality="HQ")
 
     duration = len(audio) / sampling_rate
     print(f"Audio duration: {duration:.2f} seconds")
@@ -38,22 +44,123 @@ def load_audio(audio_path: str, sampling_rate: int = 16000):
     return audio
 
 
-def transcribe(
-    audio_path: str,
+def split_audio(
+    audio,
+    sampling_rate: int = 16000,
+    chunk_seconds: float = 30.0,
+    overlap_seconds: float = 1.0,
+) -> list:
+    """
+    Split audio into overlapping fixed-length windows.
+
+    Args:
+        audio: Audio array
+        sampling_rate: Audio sampling rate
+        chunk_seconds: Window length in seconds (Whisper input is 30 s)
+        overlap_seconds: Overlap between consecutive windows in seconds
+
+    Returns:
+        List of audio arrays, each at most chunk_seconds long
+    """
+    chunk_size = int(chunk_seconds * sampling_rate)
+    overlap = int(overlap_seconds * sampling_rate)
+    step = chunk_size - overlap
+
+    # Skip a trailing window that would only contain the previous overlap
+    starts = range(0, max(len(audio) - overlap, 1), step)
+    return [audio[start : start + chunk_size] for start in starts]
+
+
+# Shortest repeated run treated as chunk overlap; shorter matches (a shared
+# kana or letter at the boundary) are coincidence and must not drop text
+MIN_OVERLAP_CHARS = 4  # scripts written without spaces (Japanese, Chinese)
+MIN_OVERLAP_WORDS = 2  # space-separated languages
+
+
+def _is_cjk(char: str) -> bool:
+    """Whether a character belongs to a script written without word spaces."""
+    code = ord(char)
+    return (
+        0x3000 <= code <= 0x30FF  # CJK punctuation, Hiragana, Katakana
+        or 0x3400 <= code <= 0x9FFF  # CJK ideographs
+        or 0xF900 <= code <= 0xFAFF  # CJK compatibility ideographs
+        or 0xFF00 <= code <= 0xFFEF  # Half-width / full-width forms
+    )
+
+
+def _overlap_size(
+    previous: list | str,
+    following: list | str,
+    min_size: int,
+    max_size: int,
+) -> int:
+    """Length of the longest suffix of previous that following starts with."""
+    for size in range(min(max_size, len(previous), len(following)), min_size - 1, -1):
+        if previous[-size:] == following[:size]:
+            return size
+    return 0
+
+
+def merge_transcriptions(texts: list[str], max_overlap: int = 32) -> str:
+    """
+    Concatenate chunk transcriptions, removing text repeated across overlaps.
+
+    Japanese/Chinese text is compared and joined per character; other text
+    is compared per word and joined with a space.
+
+    Args:
+        texts: Transcriptions of consecutive overlapping chunks
+        max_overlap: Maximum number of characters (or words) to check for repetition
+
+    Returns:
+        Merged transcription text
+    """
+    merged = ""
+    for text in texts:
+        text = text.strip()
+        if not text:
+            continue
+        if not merged:
+            merged = text
+            continue
+
+        if _is_cjk(merged[-1]) or _is_cjk(text[0]):
+            overlap = _overlap_size(merged, text, MIN_OVERLAP_CHARS, max_overlap)
+            merged += text[overlap:]
+        else:
+            # Only the tail of the merged text can overlap the next chunk
+            tail = merged.rsplit(None, max_overlap)[-max_overlap:]
+            words = text.split()
+            overlap = _overlap_size(tail, words, MIN_OVERLAP_WORDS, max_overlap)
+            if overlap < len(words):
+                merged += " " + " ".join(words[overlap:])
+    return merged
+
+
+# Loaded (model, processor, device), keyed by (model_path, base_model, compile_model)
+_LOADED_MODELS: dict[tuple, tuple] = {}
+
+
+def load_model(
     model_path: str = "models/final",
     base_model: str = "openai/whisper-small",
+    compile_model: bool = False,
 ):
     """
-    Transcribe audio file using fine-tuned Whisper model.
+    Load fine-tuned Whisper model and processor, reusing them across calls.
 
     Args:
-        audio_path: Path to audio file
         model_path: Path to fine-tuned LoRA model directory
         base_model: Base Whisper model name
+        compile_model: Compile the model forward pass with torch.compile
 
     Returns:
-        Transcription text
+        Tuple of (model, processor, device)
     """
+    key = (str(model_path), base_model, compile_model)
+    if key in _LOADED_MODELS:
+        return _LOADED_MODELS[key]
+
     # Setup device
     device = get_device()
 
@@ -72,32 +179,94 @@ def transcribe(
         device=device,
     )
 
+    # Use SDPA attention like the base-model path (set after loading, since
+    # load_lora_whisper does not take attn_implementation; transformers>=4.56)
+    if hasattr(model, "set_attn_implementation"):
+        model.set_attn_implementation("sdpa")
+
     model.eval()
 
+    if compile_model:
+        # Compile forward (not the module) so model.generate uses the compiled graph
+        print("Compiling model with torch.compile...")
+        # Fixed-shape KV cache avoids recompiling as the sequence grows
+        model.generation_config.cache_implementation = "static"
+        model.forward = torch.compile(model.forward, mode="reduce-overhead")
+
     # Load processor
     print("\nLoading processor...")
     processor = WhisperProcessor.from_pretrained(str(model_path))
 
+    _LOADED_MODELS[key] = (model, processor, device)
+    return _LOADED_MODELS[key]
+
+
+def transcribe(
+    audio_path: str,
+    model_path: str = "models/final",
+    base_model: str = "openai/whisper-small",
+    compile_model: bool = False,
+    chunk_batch: int = 8,
+    max_new_tokens: int = 128,
+):
+    """
+    Transcribe audio file using fine-tuned Whisper model.
+
+    Audio longer than 30 seconds is split into overlapping 30-second chunks
+    that are transcribed in batches of chunk_batch.
+
+    Args:
+        audio_path: Path to audio file
+        model_path: Path to fine-tuned LoRA model directory
+        base_model: Base Whisper model name
+        compile_model: Compile the model forward pass with torch.compile
+        chunk_batch: Number of 30-second chunks per generate call
+        max_new_tokens: Maximum number of tokens generated per chunk
+
+    Returns:
+        Transcription text
+    """
+    model, processor, device = load_model(
+        model_path=model_path,
+        base_model=base_model,
+        compile_model=compile_model,
+    )
+
     # Load audio
     print("\n" + "=" * 70)
     print("LOADING AUDIO")
     print("=" * 70)
 
     audio = load_audio(audio_path)
+    chunks = split_audio(audio)
+    print(f"Split into {len(chunks)} chunk(s) of up to 30 seconds")
 
     # Extract features
     print("\n" + "=" * 70)
     print("EXTRACTING FEATURES")
     print("=" * 70)
 
-    input_features = processor.feature_extractor(
-        audio, sampling_rate=16000, return_tensors="pt"
-    ).input_features
-
-    input_features = input_features.to(device)
+    # STFT and mel projection run on device in a single batched call
+    input_features = extract_features(processor.feature_extractor, chunks, device)
 
     print(f"Input features shape: {input_features.shape}")
 
+    # Greedy decoding with KV cache
+    generate_kwargs = {
+        "max_new_tokens": max_new_tokens,
+        "num_beams": 1,
+        "do_sample": False,
+        "use_cache": True,
+    }
+
+    if compile_model:
+        # Warm up once so compilation is not counted in inference time
+        print("Warming up compiled model...")
+        with torch.no_grad():
+            model.generate(
+                torch.zeros_like(input_features[:chunk_batch]), **generate_kwargs
+            )
+
     # Generate transcription
     print("\n" + "=" * 70)
     print("GENERATING TRANSCRIPTION")
@@ -105,18 +274,22 @@ def transcribe(
 
     start_time = time.time()
 
+    generated_ids = []
     with torch.no_grad():
-        generated_ids = model.generate(
-            input_features,
-            max_length=225,
-        )
+        for i in range(0, len(input_features), chunk_batch):
+            output_ids = model.generate(
+                input_features[i : i + chunk_batch],
+                **generate_kwargs,
+            )
+            generated_ids.extend(output_ids.tolist())
 
     inference_time = time.time() - start_time
 
-    # Decode
-    transcription = processor.tokenizer.decode(
-        generated_ids[0], skip_special_tokens=True
-    )
+    # Decode all chunks in a single call
+    texts = processor.tokenizer.batch_decode(generated_ids, skip_special_tokens=True)
+
+    # Merge chunk transcriptions
+    transcription = merge_transcriptions(texts)
 
     print(f"\nInference time: {inference_time:.2f} seconds")
 
@@ -146,6 +319,23 @@ def main():
         default="openai/whisper-small",
         help="Base Whisper model name",
     )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="Compile the model with torch.compile before inference",
+    )
+    parser.add_argument(
+        "--chunk-batch",
+        type=int,
+        default=8,
+        help="Number of 30-second chunks transcribed per batch (long audio)",
+    )
+    parser.add_argument(
+        "--max-new-tokens",
+        type=int,
+        default=128,
+        help="Maximum number of tokens generated per 30-second chunk",
+    )
 
     args = parser.parse_args()
 
@@ -163,6 +353,9 @@ def main():
         audio_path=str(audio_path),
         model_path=args.model,
         base_model=args.base_model,
+        compile_model=args.compile,
+        chunk_batch=args.chunk_batch,
+        max_new_tokens=args.max_new_tokens,
     )
 
     # Print result
@@ -2,8 +2,10 @@
 
 import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import torch
 import yaml
 from datasets import load_from_disk
@@ -13,6 +15,7 @@ from transformers import WhisperProcessor
 from transformers import WhisperForConditionalGeneration
 from finetune_whisper.models.lora_whisper import load_lora_whisper
 from finetune_whisper.utils.device import get_device, clear_mps_cache
+from finetune_whisper.utils.generation import greedy_generate
 from finetune_whisper.utils.metrics import (
     compute_wer_from_texts,
     compute_detailed_metrics,
@@ -26,6 +29,43 @@ def load_config(config_path: str = "configs/data_config.yaml") -> dict:
     return config["dataset"]
 
 
+def iter_batches(dataset, batch_size: int):
+    """
+    Iterate over dataset batches, loading the next batch in the background.
+
+    While the caller runs generation on batch N, a worker thread slices
+    batch N+1 from the dataset and stacks its features into a host tensor
+    (pinned when CUDA is available, so the device copy can be asynchronous).
+
+    Args:
+        dataset: Dataset with input_features in NumPy format
+        batch_size: Number of examples per batch
+
+    Yields:
+        Tuples of (start_index, batch, host_features)
+    """
+    pin_memory = torch.cuda.is_available()
+
+    def load(start: int):
+        batch = dataset[start : start + batch_size]
+        host_features = torch.from_numpy(np.stack(batch["input_features"]))
+        if pin_memory:
+            host_features = host_features.pin_memory()
+        return start, batch, host_features
+
+    starts = range(0, len(dataset), batch_size)
+    if not starts:
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(load, starts[0])
+        for next_start in starts[1:]:
+            current = future.result()
+            future = executor.submit(load, next_start)
+            yield current
+        yield future.result()
+
+
 def main():
     """Main evaluation pipeline."""
     parser = argparse.ArgumentParser(description="Evaluate fine-tuned Whisper model")
@@ -65,6 +105,22 @@ def main():
         default="outputs/evaluation_results.json",
         help="Output file for evaluation results",
     )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="Compile the model with torch.compile before evaluation",
+    )
+    parser.add_argument(
+        "--max-new-tokens",
+        type=int,
+        default=128,
+        help="Maximum number of tokens generated per example",
+    )
+    parser.add_argument(
+        "--quantize-encoder",
+        action="store_true",
+        help="Quantize encoder linear layers to int8 (CPU only; decoder stays in float)",
+    )
 
     args = parser.parse_args()
 
@@ -84,9 +140,13 @@ def main():
     if args.model is None:
         # Use base model without LoRA
         print(f"Using base model: {args.base_model}")
-        model = WhisperForConditionalGeneration.from_pretrained(args.base_model)
-        if device:
-            model = model.to(device)
+        # Load weights straight onto the device without an extra CPU copy
+        model = WhisperForConditionalGeneration.from_pretrained(
+            args.base_model,
+            attn_implementation="sdpa",
+            low_cpu_mem_usage=True,
+            device_map={"": device},
+        )
         processor = WhisperProcessor.from_pretrained(args.base_model)
         model_path = None
     else:
@@ -103,12 +163,36 @@ def main():
             device=device,
         )
 
+        # Same SDPA attention as the base-model path (set after loading, since
+        # load_lora_whisper does not take attn_implementation; transformers>=4.56)
+        if hasattr(model, "set_attn_implementation"):
+            model.set_attn_implementation("sdpa")
+
         # Load processor from base model (checkpoints don't have processor files)
         print("\nLoading processor...")
         processor = WhisperProcessor.from_pretrained(args.base_model)
 
     model.eval()
 
+    if args.quantize_encoder:
+        if device.type != "cpu":
+            print(f"\nWarning: int8 encoder quantization is CPU-only, skipping on {device}")
+        else:
+            print("\nQuantizing encoder linear layers to int8...")
+            # Fold LoRA adapters into the base weights before quantizing
+            if hasattr(model, "merge_and_unload"):
+                model = model.merge_and_unload()
+            torch.ao.quantization.quantize_dynamic(
+                model.get_encoder(), {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+
+    if args.compile:
+        # Compile forward so the decoding loop's model(...) calls hit the compiled graph
+        print("\nCompiling model with torch.compile...")
+        model.forward = torch.compile(model.forward, dynamic=True)
+
+    model_dtype = next(model.parameters()).dtype
+
     # Load dataset
     print("\n" + "=" * 70)
     print("LOADING DATASET")
@@ -141,6 +225,15 @@ def main():
         eval_dataset = eval_dataset.select(range(min(args.max_samples, len(eval_dataset))))
         print(f"Limited to {len(eval_dataset)} samples")
 
+    # Bucket by reference length so rows in a batch finish decoding together
+    order = np.argsort([len(labels) for labels in eval_dataset["labels"]], kind="stable")
+    eval_dataset = eval_dataset.select(order.tolist())
+
+    # Read features as NumPy arrays (float16 on disk) instead of nested lists
+    eval_dataset = eval_dataset.with_format(
+        "numpy", columns=["input_features"], output_all_columns=True
+    )
+
     # Run evaluation
     print("\n" + "=" * 70)
     print("RUNNING EVALUATION")
@@ -149,59 +242,62 @@ def main():
     predictions = []
     references = []
 
+    tokenizer = processor.tokenizer
+    pad_token_id = tokenizer.pad_token_id
+
     print(f"Processing {len(eval_dataset)} examples...")
 
     with torch.no_grad():
-        for i in tqdm(range(0, len(eval_dataset), args.batch_size)):
-            batch = eval_dataset[i : i + args.batch_size]
-
-            # Get input features
-            if isinstance(batch["input_features"], list):
-                input_features = torch.tensor(batch["input_features"]).to(device)
-            else:
-                input_features = torch.tensor([batch["input_features"]]).to(device)
-
-            # Generate predictions
-            generated_ids = model.generate(
+        num_batches = (len(eval_dataset) + args.batch_size - 1) // args.batch_size
+        batches = iter_batches(eval_dataset, args.batch_size)
+        for i, batch, host_features in tqdm(batches, total=num_batches):
+            # Copy the (B, 80, 3000) batch to device, upcasting from the float16 cache
+            input_features = host_features.to(device, non_blocking=True).to(model_dtype)
+
+            # Generate predictions (finished rows leave the batch early)
+            generated_ids = greedy_generate(
+                model,
                 input_features,
-                max_length=225,
+                max_new_tokens=args.max_new_tokens,
             )
 
             # Decode predictions
-            transcriptions = processor.batch_decode(
+            transcriptions = tokenizer.batch_decode(
                 generated_ids, skip_special_tokens=True
             )
             predictions.extend(transcriptions)
 
-            # Decode references
-            if isinstance(batch["labels"], list):
-                labels_batch = batch["labels"]
-            else:
-                labels_batch = [batch["labels"]]
-
-            for labels in labels_batch:
-                # Convert to list if tensor
-                if isinstance(labels, torch.Tensor):
-                    labels = labels.tolist()
+            # Decode references: pad to a 2D array, map -100 to the pad token
+            labels_batch = batch["labels"]
+            max_len = max(len(labels) for labels in labels_batch)
+            labels_arr = np.full((len(labels_batch), max_len), -100, dtype=np.int64)
+            for row, labels in enumerate(labels_batch):
+                labels_arr[row, : len(labels)] = labels
+            labels_arr = np.where(labels_arr == -100, pad_token_id, labels_arr)
 
-                # Remove -100 padding tokens
-                labels = [l for l in labels if l != -100]
-
-                # Decode
-                reference = processor.tokenizer.decode(labels, skip_special_tokens=True)
-                references.append(reference)
+            references.extend(
+                tokenizer.batch_decode(labels_arr, skip_special_tokens=True)
+            )
 
             # Clear cache periodically
             if i % (args.batch_size * 10) == 0:
                 clear_mps_cache()
 
+    # Restore original dataset order
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    predictions = [predictions[j] for j in inverse]
+    references = [references[j] for j in inverse]
+
     # Compute metrics
     print("\n" + "=" * 70)
     print("COMPUTING METRICS")
     print("=" * 70)
 
     wer = compute_wer_from_texts(predictions, references)
-    detailed_metrics = compute_detailed_metrics(predictions, references)
+    detailed_metrics = compute_detailed_metrics(
+        predictions, references, language=config["language"]
+    )
 
     # Print results
     print("\n" + "=" * 70)
@@ -209,6 +305,7 @@ def main():
     print("=" * 70)
 
     print(f"\nWord Error Rate (WER): {wer:.2f}%")
+    print(f"Character Error Rate (CER): {detailed_metrics['cer']:.2f}%")
     print(f"\nDetailed Metrics:")
     print(f"  Match Error Rate (MER): {detailed_metrics['mer']:.2f}%")
     print(f"  Word Information Lost (WIL): {detailed_metrics['wil']:.2f}%")
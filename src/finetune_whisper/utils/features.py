@@ -0,0 +1,112 @@
+"""Batched log-mel feature extraction for Whisper on the target device."""
+
+import threading
+
+import numpy as np
+import torch
+from transformers import WhisperFeatureExtractor
+
+
+# Hann window and mel filter bank tensors, keyed by (n_fft, n_mels, device)
+_FILTER_CACHE: dict[tuple, tuple[torch.Tensor, torch.Tensor]] = {}
+
+# Per-thread padded waveform buffer; grows to the largest batch seen and is
+# sliced for smaller ones, so varying batch sizes never pin extra arrays
+_BUFFERS = threading.local()
+
+
+def _get_filters(
+    feature_extractor: WhisperFeatureExtractor,
+    device: torch.device,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """
+    Get Hann window and mel filter bank tensors on device (cached).
+
+    Args:
+        feature_extractor: WhisperFeatureExtractor providing STFT parameters
+        device: Device to place the tensors on
+
+    Returns:
+        Tuple of (window, mel_filters) where mel_filters is (n_mels, n_freqs)
+    """
+    key = (feature_extractor.n_fft, feature_extractor.feature_size, str(device))
+    if key not in _FILTER_CACHE:
+        window = torch.hann_window(feature_extractor.n_fft, device=device)
+        mel_filters = torch.from_numpy(
+            np.ascontiguousarray(feature_extractor.mel_filters.T)
+        ).to(device, torch.float32)
+        _FILTER_CACHE[key] = (window, mel_filters)
+    return _FILTER_CACHE[key]
+
+
+def _get_waveform_buffer(batch_size: int, n_samples: int) -> np.ndarray:
+    """
+    Get a reusable (batch_size, n_samples) float32 buffer for this thread.
+
+    Args:
+        batch_size: Number of clips
+        n_samples: Samples per padded clip
+
+    Returns:
+        Uninitialized float32 array (a view of the thread's buffer); callers
+        overwrite every element
+    """
+    buffer = getattr(_BUFFERS, "buffer", None)
+    if (
+        buffer is None
+        or buffer.shape[1] != n_samples
+        or buffer.shape[0] < batch_size
+    ):
+        buffer = _BUFFERS.buffer = np.empty((batch_size, n_samples), dtype=np.float32)
+    return buffer[:batch_size]
+
+
+def extract_features(
+    feature_extractor: WhisperFeatureExtractor,
+    audios: list[np.ndarray],
+    device: torch.device,
+) -> torch.Tensor:
+    """
+    Compute Whisper log-mel features for a batch of 16kHz clips on device.
+
+    Mirrors WhisperFeatureExtractor._torch_extract_fbank_features, but runs a
+    single batched STFT and mel projection instead of one NumPy pass per clip.
+
+    Args:
+        feature_extractor: WhisperFeatureExtractor providing STFT parameters
+        audios: List of mono float waveforms at the extractor's sampling rate
+        device: Device to run the STFT on
+
+    Returns:
+        Tensor of shape (batch, n_mels, n_frames) on device
+    """
+    n_samples = feature_extractor.n_samples
+
+    # Pad / truncate every clip to 30 seconds in a reused buffer
+    waveforms = _get_waveform_buffer(len(audios), n_samples)
+    for i, audio in enumerate(audios):
+        clip = np.asarray(audio, dtype=np.float32)[:n_samples]
+        waveforms[i, : len(clip)] = clip
+        waveforms[i, len(clip) :] = 0.0
+
+    window, mel_filters = _get_filters(feature_extractor, device)
+    waveform = torch.from_numpy(waveforms).to(device)
+
+    stft = torch.stft(
+        waveform,
+        feature_extractor.n_fft,
+        feature_extractor.hop_length,
+        window=window,
+        return_complex=True,
+    )
+    magnitudes = stft[..., :-1].abs() ** 2
+
+    mel_spec = mel_filters @ magnitudes
+    log_spec = torch.clamp(mel_spec, min=1e-10).log10()
+
+    # Dynamic range compression per clip, as in Whisper
+    max_val = log_spec.amax(dim=(1, 2), keepdim=True)
+    log_spec = torch.maximum(log_spec, max_val - 8.0)
+    log_spec = (log_spec + 4.0) / 4.0
+
+    return log_spec
@@ -0,0 +1,134 @@
+"""Greedy decoding for Whisper that drops finished sequences from the batch."""
+
+import torch
+from transformers.models.whisper.tokenization_whisper import TO_LANGUAGE_CODE
+
+
+def get_decoder_prompt_ids(model) -> list[int] | None:
+    """
+    Build the forced decoder prompt from the model's generation config.
+
+    Args:
+        model: Whisper model (or PEFT wrapper) with a generation_config
+
+    Returns:
+        List of token IDs (start, language, task and no-timestamps tokens), or
+        None when no language is configured
+    """
+    gen_config = model.generation_config
+
+    language = getattr(gen_config, "language", None)
+    if language is None:
+        return None
+
+    language = language.lower()
+    language = TO_LANGUAGE_CODE.get(language, language).strip("<|>")
+    task = getattr(gen_config, "task", None) or "transcribe"
+
+    return [
+        gen_config.decoder_start_token_id,
+        gen_config.lang_to_id[f"<|{language}|>"],
+        gen_config.task_to_id[task],
+        gen_config.no_timestamps_token_id,
+    ]
+
+
+def _select_cache(past_key_values, indices: torch.Tensor):
+    """Keep only the given batch rows of the decoder KV cache."""
+    if hasattr(past_key_values, "reorder_cache"):
+        past_key_values.reorder_cache(indices)
+        return past_key_values
+    return tuple(
+        tuple(tensor.index_select(0, indices) for tensor in layer)
+        for layer in past_key_values
+    )
+
+
+@torch.no_grad()
+def greedy_generate(
+    model,
+    input_features: torch.Tensor,
+    max_new_tokens: int = 128,
+) -> list[list[int]]:
+    """
+    Greedy-decode a batch, removing rows from the batch once they emit EOS.
+
+    The encoder runs once for the whole batch. At every decoder step, rows
+    that have finished are dropped from the encoder states, the KV cache and
+    the decoder inputs, so later steps only run for the active rows.
+
+    Without a configured language (e.g. the base model), this falls back to
+    model.generate, which detects the language and still forces the
+    transcribe task and no-timestamps mode.
+
+    Args:
+        model: Whisper model (or PEFT wrapper)
+        input_features: Log-mel features of shape (B, 80, 3000)
+        max_new_tokens: Maximum number of tokens to generate after the prompt
+
+    Returns:
+        List of generated token ID lists, in the original batch order
+    """
+    prompt_ids = get_decoder_prompt_ids(model)
+    if prompt_ids is None:
+        output_ids = model.generate(
+            input_features=input_features, max_new_tokens=max_new_tokens
+        )
+        return output_ids.tolist()
+
+    gen_config = model.generation_config
+    eos_token_id = gen_config.eos_token_id
+    device = input_features.device
+    batch_size = input_features.shape[0]
+
+    suppress_tokens = torch.tensor(
+        gen_config.suppress_tokens or [], dtype=torch.long, device=device
+    )
+    begin_suppress_tokens = torch.tensor(
+        gen_config.begin_suppress_tokens or [], dtype=torch.long, device=device
+    )
+
+    encoder_outputs = model.get_encoder()(input_features)
+
+    decoder_input_ids = torch.tensor(
+        [prompt_ids] * batch_size, dtype=torch.long, device=device
+    )
+    active_idx = torch.arange(batch_size, device=device)
+    sequences = [list(prompt_ids) for _ in range(batch_size)]
+    past_key_values = None
+
+    for step in range(max_new_tokens):
+        outputs = model(
+            encoder_outputs=encoder_outputs,
+            decoder_input_ids=decoder_input_ids,
+            past_key_values=past_key_values,
+            use_cache=True,
+        )
+        logits = outputs.logits[:, -1, :]
+        if suppress_tokens.numel():
+            logits[:, suppress_tokens] = -float("inf")
+        if step == 0 and begin_suppress_tokens.numel():
+            logits[:, begin_suppress_tokens] = -float("inf")
+
+        next_tokens = logits.argmax(dim=-1)
+
+        for row, token in zip(active_idx.tolist(), next_tokens.tolist()):
+            sequences[row].append(token)
+
+        finished = next_tokens == eos_token_id
+        if finished.all():
+            break
+
+        past_key_values = outputs.past_key_values
+        if finished.any():
+            keep = (~finished).nonzero(as_tuple=True)[0]
+            active_idx = active_idx[keep]
+            next_tokens = next_tokens[keep]
+            past_key_values = _select_cache(past_key_values, keep)
+            encoder_outputs.last_hidden_state = (
+                encoder_outputs.last_hidden_state.index_select(0, keep)
+            )
+
+        decoder_input_ids = next_tokens.unsqueeze(-1)
+
+    return sequences
@@ -1,20 +1,58 @@
 """Metrics computation for Whisper evaluation."""
 
-import evaluate
-from transformers import WhisperTokenizer
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
+import numpy as np
 
-def create_compute_metrics(tokenizer: WhisperTokenizer):
+if TYPE_CHECKING:
+    from transformers import WhisperTokenizer
+
+
+_WER_METRIC = None
+_WER_METRIC_LOCK = threading.Lock()
+
+# Languages written without spaces between words; whitespace is ignored for CER
+CHAR_LEVEL_LANGUAGES = {"ja", "zh", "th"}
+
+
+def _get_wer():
+    """
+    Get the shared WER metric, loading it on first use.
+
+    Returns:
+        evaluate WER metric instance
+    """
+    global _WER_METRIC
+    if _WER_METRIC is None:
+        with _WER_METRIC_LOCK:
+            if _WER_METRIC is None:
+                # Deferred: importing evaluate pulls in datasets and huggingface_hub
+                import evaluate
+
+                _WER_METRIC = evaluate.load("wer")
+    return _WER_METRIC
+
+
+def create_compute_metrics(tokenizer: "WhisperTokenizer"):
     """
     Create compute_metrics function for Seq2SeqTrainer.
 
     Args:
-        tokenizer: WhisperTokenizer for decoding predictions
+        tokenizer: WhisperTokenizer for decoding predictions (a slow tokenizer
+            is replaced by the Rust-backed WhisperTokenizerFast)
 
     Returns:
         Function that computes WER metric
     """
-    metric = evaluate.load("wer")
+    metric = _get_wer()
+
+    # batch_decode on the fast tokenizer is a single call into Rust
+    if not tokenizer.is_fast:
+        from transformers import WhisperTokenizerFast
+
+        tokenizer = WhisperTokenizerFast.from_pretrained(tokenizer.name_or_path)
 
     def compute_metrics(pred):
         """
@@ -29,12 +67,28 @@ def create_compute_metrics(tokenizer: WhisperTokenizer):
         pred_ids = pred.predictions
         label_ids = pred.label_ids
 
-        # Replace -100 with pad token id (can't decode -100)
-        label_ids[label_ids == -100] = tokenizer.pad_token_id
-
-        # Decode predictions and labels
-        pred_str = tokenizer.batch_decode(pred_ids, skip_special_tokens=True)
-        label_str = tokenizer.batch_decode(label_ids, skip_special_tokens=True)
+        # Reduce logits to token IDs if generation was not used
+        if pred_ids.ndim == 3:
+            pred_ids = np.argmax(pred_ids, axis=-1)
+
+        # Stack predictions and labels (padded to a common width) so both are
+        # decoded in one batch_decode call
+        width = max(pred_ids.shape[1], label_ids.shape[1])
+        combined = np.full(
+            (len(pred_ids) + len(label_ids), width), -100, dtype=np.int64
+        )
+        combined[: len(pred_ids), : pred_ids.shape[1]] = pred_ids
+        combined[len(pred_ids) :, : label_ids.shape[1]] = label_ids
+
+        # Replace -100 with pad token id (can't decode -100); the Trainer's
+        # label_ids are not mutated
+        combined[combined == -100] = tokenizer.pad_token_id
+
+        decoded = tokenizer.batch_decode(
+            combined, skip_special_tokens=True, decode_with_timestamps=False
+        )
+        pred_str = decoded[: len(pred_ids)]
+        label_str = decoded[len(pred_ids) :]
 
         # Compute WER
         wer = 100 * metric.compute(predictions=pred_str, references=label_str)
@@ -48,6 +102,9 @@ def compute_wer_from_texts(predictions: list[str], references: list[str]) -> flo
     """
     Compute WER from lists of prediction and reference texts.
 
+    Uses the same normalization as compute_detailed_metrics, so the two WER
+    values agree.
+
     Args:
         predictions: List of predicted transcriptions
         references: List of reference transcriptions
@@ -55,38 +112,113 @@ def compute_wer_from_texts(predictions: list[str], references: list[str]) -> flo
     Returns:
         WER as percentage (0-100)
     """
-    metric = evaluate.load("wer")
-    wer = 100 * metric.compute(predictions=predictions, references=references)
-    return wer
+    import jiwer
+
+    predictions, references = _normalize_texts(predictions, references)
+    if not references:
+        return 0.0
+    return 100 * jiwer.wer(references, predictions)
 
 
-def compute_detailed_metrics(predictions: list[str], references: list[str]) -> dict:
+@lru_cache(maxsize=1)
+def _get_jiwer_normalizer():
+    """
+    Build the jiwer normalization pipeline once.
+
+    Returns:
+        jiwer.Compose transform mapping a list of strings to normalized strings
+    """
+    import jiwer
+
+    return jiwer.Compose(
+        [
+            jiwer.ToLowerCase(),
+            jiwer.RemovePunctuation(),
+            jiwer.RemoveMultipleSpaces(),
+            jiwer.Strip(),
+        ]
+    )
+
+
+def _normalize_texts(
+    predictions: list[str],
+    references: list[str],
+) -> tuple[list[str], list[str]]:
+    """
+    Normalize texts and drop pairs whose reference is empty afterwards.
+
+    jiwer rejects empty references, e.g. a punctuation-only one.
+
+    Args:
+        predictions: List of predicted transcriptions
+        references: List of reference transcriptions
+
+    Returns:
+        Tuple of (normalized predictions, normalized references)
+    """
+    normalize = _get_jiwer_normalizer()
+    predictions = normalize(list(predictions))
+    references = normalize(list(references))
+
+    keep = [i for i, reference in enumerate(references) if reference]
+    return [predictions[i] for i in keep], [references[i] for i in keep]
+
+
+def compute_detailed_metrics(
+    predictions: list[str],
+    references: list[str],
+    language: str | None = None,
+) -> dict:
     """
     Compute detailed error metrics using jiwer.
 
+    Texts are lowercased and stripped of punctuation before alignment; pairs
+    with an empty normalized reference are skipped. Word-level metrics are
+    reported under 'wer'/'mer'/'wil'/'wip'. The character error rate is
+    reported separately under 'cer'. For languages written without spaces
+    (CHAR_LEVEL_LANGUAGES), whitespace is ignored for the CER.
+
     Args:
         predictions: List of predicted transcriptions
         references: List of reference transcriptions
+        language: Language code of the texts (e.g. 'ja')
 
     Returns:
-        Dictionary with detailed metrics (WER, substitutions, deletions, insertions)
+        Dictionary with detailed metrics (WER, CER, substitutions, deletions,
+        insertions)
     """
     import jiwer
 
-    # Compute WER and related metrics
-    wer = jiwer.wer(references, predictions)
-    mer = jiwer.mer(references, predictions)
-    wil = jiwer.wil(references, predictions)
-    wip = jiwer.wip(references, predictions)
-
-    # Get detailed operation counts
+    predictions, references = _normalize_texts(predictions, references)
+    if not references:
+        return {
+            "wer": 0.0,
+            "cer": 0.0,
+            "mer": 0.0,
+            "wil": 0.0,
+            "wip": 100.0,
+            "substitutions": 0,
+            "deletions": 0,
+            "insertions": 0,
+            "hits": 0,
+        }
+
+    # Single alignment pass; WER/MER/WIL/WIP and operation counts all derive from it
     output = jiwer.process_words(references, predictions)
 
+    if language in CHAR_LEVEL_LANGUAGES:
+        char_predictions = ["".join(text.split()) for text in predictions]
+        char_references = ["".join(text.split()) for text in references]
+    else:
+        char_predictions, char_references = predictions, references
+    cer = jiwer.cer(char_references, char_predictions)
+
     return {
-        "wer": wer * 100,  # Convert to percentage
-        "mer": mer * 100,  # Match Error Rate
-        "wil": wil * 100,  # Word Information Lost
-        "wip": wip * 100,  # Word Information Preserved
+        "wer": output.wer * 100,  # Convert to percentage
+        "cer": cer * 100,  # Character Error Rate
+        "mer": output.mer * 100,  # Match Error Rate
+        "wil": output.wil * 100,  # Word Information Lost
+        "wip": output.wip * 100,  # Word Information Preserved
         "substitutions": output.substitutions,
         "deletions": output.deletions,
         "insertions": output.insertions,
@@ -1,4 +1,5 @@
 """アプリケーション設定"""
+from functools import lru_cache
 from pathlib import Path
 from pydantic_settings import BaseSettings
 
@@ -10,6 +11,7 @@ class Settings(BaseSettings):
     APP_NAME: str = "Voice Ascend Webapp"
     APP_VERSION: str = "0.1.0"
     DEBUG: bool = False
+    PROFILING: bool = False  # ?profile=1 でpyinstrumentのプロファイルを返す (要 pyinstrument)
 
     # Paths (relative to project root)
     PROJECT_ROOT: Path = Path(__file__).parent.parent.parent
@@ -17,6 +19,7 @@ class Settings(BaseSettings):
     WEBAPP_AUDIO_DIR: Path = WEBAPP_DATA_DIR / "audio" / "recordings"
     WEBAPP_EXPORTS_DIR: Path = WEBAPP_DATA_DIR / "exports"
     WEBAPP_DB_DIR: Path = WEBAPP_DATA_DIR / "database"
+    WEBAPP_JINJA_CACHE_DIR: Path = WEBAPP_DATA_DIR / ".jinja_cache"
 
     # ML Pipeline paths (共有参照用)
     ML_DATA_DIR: Path = PROJECT_ROOT / "data"
@@ -25,6 +28,9 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///data/webapp/database/webapp.db"
+    DB_POOL_SIZE: int = 10  # 常時保持する接続数
+    DB_MAX_OVERFLOW: int = 10  # 混雑時に追加で開く接続数
+    DB_POOL_RECYCLE: int = 1800  # seconds; これより古い接続は作り直す
 
     # Audio settings
     MAX_AUDIO_DURATION: int = 30  # seconds
@@ -39,16 +45,25 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = True
+        frozen = True  # 起動後は変更しない (リクエスト間で共有)
 
 
 settings = Settings()
 
-# ディレクトリが存在することを確認
-settings.WEBAPP_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
-settings.WEBAPP_EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
-settings.WEBAPP_DB_DIR.mkdir(parents=True, exist_ok=True)
 
+def ensure_dirs() -> None:
+    """データディレクトリを作成 (起動時に一度だけ呼ぶ)"""
+    for path in (
+        settings.WEBAPP_DATA_DIR,
+        settings.WEBAPP_AUDIO_DIR,
+        settings.WEBAPP_EXPORTS_DIR,
+        settings.WEBAPP_DB_DIR,
+        settings.WEBAPP_JINJA_CACHE_DIR,
+    ):
+        path.mkdir(parents=True, exist_ok=True)
 
+
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get application settings instance."""
     return settings
@@ -1,4 +1,5 @@
 """データベース設定とセッション管理"""
+from sqlalchemy import Index, event, text
 from sqlmodel import SQLModel, create_engine, Session
 from webapp.config import settings
 
@@ -12,12 +13,77 @@ engine = create_engine(
     },
     # Ensure UTF-8 encoding
     pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
 )
 
 
+# 接続ごとに適用するSQLite PRAGMA
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",  # 読み取りと書き込みを並行実行
+    "synchronous=NORMAL",  # WALではコミットごとのfsyncが不要
+    "temp_store=MEMORY",
+    "mmap_size=268435456",  # 256 MiB
+    "cache_size=-65536",  # 64 MiB
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """新しいSQLite接続にPRAGMAを設定"""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+# 絞り込み・並び替え用インデックス (モデル名, インデックス名, カラム)
+EXTRA_INDEXES = (
+    # get_recordings: 絞り込み後そのまま created_at 順に走査し LIMIT で打ち切る
+    (
+        "Recording",
+        "ix_recording_text_val_created",
+        ("text_id", "is_validated", "created_at"),
+    ),
+    ("Recording", "ix_recording_val_created", ("is_validated", "created_at")),
+    # エクスポートの duration 範囲絞り込み用
+    (
+        "Recording",
+        "ix_recording_validated_dur_created",
+        ("is_validated", "duration", "created_at"),
+    ),
+    ("DatasetExport", "ix_datasetexport_created_at", ("created_at",)),
+    ("Text", "ix_text_language_source_created", ("language", "source", "created_at")),
+)
+
+# 上記のインデックスで置き換えられたもの (既存DBから削除する)
+OBSOLETE_INDEXES = ("ix_recording_text_id_validated", "ix_recording_is_validated")
+
+
 def create_db_and_tables():
     """全てのテーブルを作成"""
     SQLModel.metadata.create_all(engine)
+    create_indexes()
+
+
+def create_indexes():
+    """既存DBにも不足しているインデックスを作成し、不要になったものを削除"""
+    from webapp.models.dataset import DatasetExport
+    from webapp.models.recording import Recording
+    from webapp.models.text import Text
+
+    models = {"Recording": Recording, "DatasetExport": DatasetExport, "Text": Text}
+    for model_name, name, columns in EXTRA_INDEXES:
+        table = models[model_name].__table__
+        if any(index.name == name for index in table.indexes):
+            continue
+        index = Index(name, *(table.c[column] for column in columns))
+        index.create(engine, checkfirst=True)
+
+    with engine.begin() as connection:
+        for name in OBSOLETE_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
 
 
 def get_session():
@@ -8,11 +8,13 @@ from pathlib import Path
 from fastapi import FastAPI, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from sqlmodel import Session
 from loguru import logger
 
-from webapp.config import get_settings
+from webapp.config import ensure_dirs, get_settings
 from webapp.database import create_db_and_tables, get_session
+from webapp.responses import JSONResponse
 from webapp.routes import texts, recordings, audio, datasets
 
 
@@ -24,13 +26,9 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("Starting Voice Ascend Whisper web application...")
-    settings = get_settings()
 
     # Create necessary directories
-    settings.WEBAPP_DATA_DIR.mkdir(parents=True, exist_ok=True)
-    settings.WEBAPP_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
-    settings.WEBAPP_EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
-    settings.WEBAPP_DB_DIR.mkdir(parents=True, exist_ok=True)
+    ensure_dirs()
 
     # Initialize database
     logger.info("Initializing database...")
@@ -51,6 +49,7 @@ app = FastAPI(
     description="Web application for collecting Japanese voice data for Whisper fine-tuning",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=JSONResponse,
 )
 
 # Get settings
@@ -64,11 +63,37 @@ app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 # Setup Jinja2 templates
 templates_path = Path(__file__).parent / "templates"
 templates_path.mkdir(parents=True, exist_ok=True)
-templates = Jinja2Templates(directory=str(templates_path))
+
+# Compiled templates are cached on disk so cold routes skip parse/compile
+# (the directory is created by ensure_dirs() at startup)
+jinja_env = Environment(
+    loader=FileSystemLoader(str(templates_path)),
+    autoescape=True,
+    auto_reload=settings.DEBUG,
+    bytecode_cache=FileSystemBytecodeCache(str(settings.WEBAPP_JINJA_CACHE_DIR)),
+)
+templates = Jinja2Templates(env=jinja_env)
 
 # Make templates available globally
 app.state.templates = templates
 
+# Per-request profiling (opt-in): append ?profile=1 to any URL
+if settings.PROFILING:
+    from fastapi.responses import HTMLResponse
+    from pyinstrument import Profiler
+
+    @app.middleware("http")
+    async def profile_request(request, call_next):
+        """Return a pyinstrument HTML profile instead of the response."""
+        if request.query_params.get("profile") != "1":
+            return await call_next(request)
+
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        await call_next(request)
+        profiler.stop()
+        return HTMLResponse(profiler.output_html())
+
 # Include routers
 app.include_router(texts.router, prefix="/texts", tags=["texts"])
 app.include_router(recordings.router, prefix="/recordings", tags=["recordings"])
@@ -89,13 +114,9 @@ async def index(
     session: Session = Depends(get_session),
 ):
     """Main dashboard page."""
-    from webapp.services.text_service import TextService
-    from webapp.services.recording_service import RecordingService
-    from webapp.services.export_service import ExportService
+    from webapp.services.dashboard_service import DashboardService
 
-    text_count = TextService.count_texts(session)
-    recording_count = RecordingService.count_recordings(session)
-    export_count = len(ExportService.get_exports(session))
+    text_count, recording_count, export_count = DashboardService.counts(session)
 
     return app.state.templates.TemplateResponse(
         "index.html",
@@ -119,10 +140,18 @@ async def health():
 
 
 if __name__ == "__main__":
+    import os
+
     import uvicorn
+
+    # 開発時 (DEBUG) はリロード付きの単一プロセス、それ以外は複数ワーカー
     uvicorn.run(
         "webapp.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=settings.DEBUG,
+        workers=1 if settings.DEBUG else max(1, (os.cpu_count() or 2) // 2),
+        loop="auto",  # uvloopがあれば使用 (Windowsでは未提供)
+        http="httptools",
+        access_log=settings.DEBUG,
     )
@@ -0,0 +1,46 @@
+"""一覧ページのキーセット (カーソル) ページング
+
+カーソルは前ページ最終行の (created_at, id) で、クエリパラメータ
+after_created / after_id として受け渡す。
+"""
+from datetime import datetime
+from typing import Optional, Sequence
+
+from fastapi import Request
+
+# 1ページあたりの件数
+PAGE_SIZE = 100
+
+
+def keyset_cursor(
+    after_created: Optional[datetime],
+    after_id: Optional[int],
+) -> Optional[tuple[datetime, int]]:
+    """クエリパラメータからカーソルを作成 (どちらかが欠けていれば先頭ページ)"""
+    if after_created is None or after_id is None:
+        return None
+    return (after_created, after_id)
+
+
+def next_page_url(
+    request: Request, rows: Sequence, limit: int = PAGE_SIZE
+) -> Optional[str]:
+    """次ページのURL (現在の絞り込み条件を維持)。最終ページならNone"""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return str(
+        request.url.include_query_params(
+            after_created=last.created_at.isoformat(),
+            after_id=last.id,
+        )
+    )
+
+
+def first_page_url(
+    request: Request, cursor: Optional[tuple[datetime, int]]
+) -> Optional[str]:
+    """先頭ページのURL (現在の絞り込み条件を維持)。先頭ページ表示中ならNone"""
+    if cursor is None:
+        return None
+    return str(request.url.remove_query_params(["after_created", "after_id"]))
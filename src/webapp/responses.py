@@ -0,0 +1,12 @@
+"""JSONレスポンスクラス
+
+orjsonがインストールされていればORJSONResponse、なければ標準のJSONResponseを使う。
+"""
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as JSONResponse
+except ImportError:
+    from fastapi.responses import JSONResponse
+
+__all__ = ["JSONResponse"]
@@ -2,25 +2,99 @@
 Audio file streaming API routes.
 """
 
+import os
+from email.utils import formatdate
+from functools import lru_cache
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from fastapi.responses import FileResponse
 from sqlmodel import Session
 
-from webapp.config import get_settings, Settings
+from webapp.config import settings
 from webapp.database import get_session
 from webapp.services.recording_service import RecordingService
 
 
 router = APIRouter()
 
+# Recordings never change once written, so browsers may cache them
+AUDIO_HEADERS = {
+    "Accept-Ranges": "bytes",
+    "Cache-Control": "public, max-age=3600",
+}
+
+
+class AudioFileResponse(FileResponse):
+    """
+    FileResponse that reads recordings in 1 MiB chunks.
+
+    Each chunk is a separate thread-pool read in Starlette; a 30 s, 16 kHz
+    16-bit WAV (~1 MB) is sent in one read instead of ~15 at the 64 KiB default.
+    """
+
+    chunk_size = 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def _real_audio_dir(audio_dir: Path) -> str:
+    """音声ディレクトリの実パス (設定は不変なので一度だけ解決)"""
+    return os.path.realpath(audio_dir)
+
+
+def _audio_response(request: Request, file_path: Path, filename: str) -> Response:
+    """
+    Build a streaming response for a WAV file.
+
+    Starlette's FileResponse answers Range requests with 206 partial
+    content, so <audio> seeking only transfers the requested byte window.
+    A weak ETag derived from the file's stat lets browsers revalidate
+    cached audio with a 304 instead of downloading it again.
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        file_path: Absolute path to audio file
+        filename: Filename for Content-Disposition
+
+    Returns:
+        FileResponse with audio file, or empty 304 response
+
+    Raises:
+        HTTPException: If the file does not exist
+    """
+    try:
+        stat_result = file_path.stat()
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+
+    etag = (
+        f'W/"{stat_result.st_ino:x}-{stat_result.st_size:x}-'
+        f'{stat_result.st_mtime_ns:x}"'
+    )
+    headers = {
+        **AUDIO_HEADERS,
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+    }
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return AudioFileResponse(
+        path=str(file_path),
+        media_type="audio/wav",
+        filename=filename,
+        headers=headers,
+        stat_result=stat_result,
+        content_disposition_type="inline",
+    )
+
 
 @router.get("/{recording_id}")
 async def stream_audio(
+    request: Request,
     recording_id: int,
     session: Session = Depends(get_session),
-    settings: Settings = Depends(get_settings),
 ):
     """
     Stream audio file by recording ID.
@@ -29,7 +103,7 @@ async def stream_audio(
         recording_id: Recording ID
 
     Returns:
-        FileResponse with audio file
+        FileResponse with audio file (304 if the client copy is current)
     """
     # Get recording from database
     recording = RecordingService.get_recording(session=session, recording_id=recording_id)
@@ -40,21 +114,14 @@ async def stream_audio(
     # Get absolute file path
     file_path = RecordingService.get_recording_file_path(recording, settings)
 
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Audio file not found")
-
-    # Return audio file
-    return FileResponse(
-        path=str(file_path),
-        media_type="audio/wav",
-        filename=recording.filename,
-    )
+    # Return audio file (404 if missing on disk)
+    return _audio_response(request, file_path, recording.filename)
 
 
 @router.get("/file/{filename}")
 async def stream_audio_by_filename(
+    request: Request,
     filename: str,
-    settings: Settings = Depends(get_settings),
 ):
     """
     Stream audio file by filename (direct access).
@@ -65,21 +132,11 @@ async def stream_audio_by_filename(
     Returns:
         FileResponse with audio file
     """
-    # Construct file path
-    file_path = settings.WEBAPP_AUDIO_DIR / filename
-
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Audio file not found")
-
     # Security check: ensure file is within audio directory
-    try:
-        file_path.resolve().relative_to(settings.WEBAPP_AUDIO_DIR.resolve())
-    except ValueError:
+    audio_dir = _real_audio_dir(settings.WEBAPP_AUDIO_DIR)
+    file_path = os.path.realpath(os.path.join(audio_dir, filename))
+    if not file_path.startswith(audio_dir + os.sep):
         raise HTTPException(status_code=403, detail="Access denied")
 
-    # Return audio file
-    return FileResponse(
-        path=str(file_path),
-        media_type="audio/wav",
-        filename=filename,
-    )
+    # Return audio file (404 if missing on disk)
+    return _audio_response(request, Path(file_path), filename)
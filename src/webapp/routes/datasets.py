@@ -1,21 +1,24 @@
 """Dataset export routes."""
 
+import asyncio
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Form, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from loguru import logger
 from sqlmodel import Session
 
-from webapp.config import Settings, get_settings
+from webapp.config import settings
 from webapp.database import get_session
 from webapp.models.dataset import DatasetExportCreate
 from webapp.services.export_service import ExportService
 
 router = APIRouter(tags=["datasets"])
 
-templates = Jinja2Templates(directory="src/webapp/templates")
+
+def get_templates(request: Request):
+    """Get Jinja2 templates from app state."""
+    return request.app.state.templates
 
 
 @router.get("/", response_class=HTMLResponse)
@@ -24,6 +27,8 @@ async def list_exports(
     session: Annotated[Session, Depends(get_session)],
 ):
     """Display list of dataset exports."""
+    templates = get_templates(request)
+
     exports = ExportService.get_exports(session)
 
     return templates.TemplateResponse(
@@ -41,6 +46,8 @@ async def export_page(
     session: Annotated[Session, Depends(get_session)],
 ):
     """Display export configuration page."""
+    templates = get_templates(request)
+
     # Get statistics
     from webapp.services.recording_service import RecordingService
 
@@ -62,8 +69,8 @@ async def export_page(
 @router.post("/export", response_class=HTMLResponse)
 async def create_export(
     request: Request,
+    background_tasks: BackgroundTasks,
     session: Annotated[Session, Depends(get_session)],
-    settings: Annotated[Settings, Depends(get_settings)],
     name: Annotated[str, Form()],
     description: Annotated[str, Form()] = "",
     train_ratio: Annotated[float, Form()] = 80.0,
@@ -74,7 +81,9 @@ async def create_export(
     max_duration: Annotated[float | None, Form()] = None,
     validated_only: Annotated[bool, Form()] = False,
 ):
-    """Create and execute dataset export."""
+    """Create dataset export and execute it in the background."""
+    templates = get_templates(request)
+
     try:
         # Validate ratios
         total_ratio = train_ratio + dev_ratio + test_ratio
@@ -101,18 +110,17 @@ async def create_export(
         db_export = ExportService.create_export(session, export_data, settings)
         logger.info(f"Created export {db_export.id}: {db_export.name}")
 
-        # Execute export
-        db_export = ExportService.execute_export(session, db_export.id, settings)
-        logger.info(f"Export {db_export.id} completed successfully")
+        # Execute export after the response is sent; the page polls for status
+        background_tasks.add_task(ExportService.run_export, db_export.id, settings)
 
-        # Return success result
         return templates.TemplateResponse(
             "datasets/export_result.html",
             {
                 "request": request,
                 "export": db_export,
-                "success": True,
+                "pending": True,
             },
+            status_code=202,
         )
 
     except ValueError as e:
@@ -137,6 +145,31 @@ async def create_export(
         )
 
 
+@router.get("/{export_id}/status", response_class=HTMLResponse)
+async def export_status(
+    request: Request,
+    export_id: int,
+    session: Annotated[Session, Depends(get_session)],
+):
+    """Render export progress (polled by HTMX until the export finishes)."""
+    templates = get_templates(request)
+
+    db_export = ExportService.get_export(session, export_id)
+    if not db_export:
+        raise HTTPException(status_code=404, detail="Export not found")
+
+    return templates.TemplateResponse(
+        "datasets/export_result.html",
+        {
+            "request": request,
+            "export": db_export,
+            "pending": db_export.status in ("pending", "processing"),
+            "success": db_export.status == "completed",
+            "error": db_export.error_message,
+        },
+    )
+
+
 @router.get("/{export_id}", response_class=HTMLResponse)
 async def export_detail(
     request: Request,
@@ -144,6 +177,8 @@ async def export_detail(
     session: Annotated[Session, Depends(get_session)],
 ):
     """Display export details."""
+    templates = get_templates(request)
+
     db_export = ExportService.get_export(session, export_id)
     if not db_export:
         raise HTTPException(status_code=404, detail="Export not found")
@@ -162,10 +197,12 @@ async def delete_export(
     request: Request,
     export_id: int,
     session: Annotated[Session, Depends(get_session)],
-    settings: Annotated[Settings, Depends(get_settings)],
 ):
     """Delete an export."""
-    deleted = ExportService.delete_export(session, export_id, settings)
+    # Removing the export tree can take a while; keep it off the event loop
+    deleted = await asyncio.to_thread(
+        ExportService.delete_export, session, export_id, settings
+    )
     if not deleted:
         raise HTTPException(status_code=404, detail="Export not found")
 
@@ -2,14 +2,25 @@
 Recording management API routes.
 """
 
+import asyncio
+import base64
+import binascii
+from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Request, Form, HTTPException, Depends
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import APIRouter, Request, Form, File, UploadFile, HTTPException, Depends
+from fastapi.responses import HTMLResponse
 from sqlmodel import Session
 
-from webapp.config import get_settings, Settings
+from webapp.config import settings
 from webapp.database import get_session
+from webapp.pagination import (
+    PAGE_SIZE,
+    first_page_url,
+    keyset_cursor,
+    next_page_url,
+)
+from webapp.responses import JSONResponse
 from webapp.services.recording_service import RecordingService
 from webapp.services.text_service import TextService
 from webapp.models.recording import Recording, RecordingCreate, RecordingUpdate
@@ -28,6 +39,8 @@ async def list_recordings(
     request: Request,
     text_id: Optional[int] = None,
     validated_only: bool = False,
+    after_created: Optional[datetime] = None,
+    after_id: Optional[int] = None,
     session: Session = Depends(get_session),
 ):
     """
@@ -36,14 +49,19 @@ async def list_recordings(
     Query parameters:
     - text_id: Filter by text ID
     - validated_only: Only show validated recordings
+    - after_created, after_id: Keyset cursor of the previous page's last row
     """
     templates = get_templates(request)
 
-    # Get filtered recordings
+    # Get filtered recordings (only the columns the list shows)
+    cursor = keyset_cursor(after_created, after_id)
     recordings = RecordingService.get_recordings(
         session=session,
+        limit=PAGE_SIZE,
         text_id=text_id,
         validated_only=validated_only,
+        after=cursor,
+        summary=True,
     )
 
     # Calculate total duration
@@ -54,9 +72,14 @@ async def list_recordings(
         {
             "request": request,
             "recordings": recordings,
+            "texts_by_id": TextService.get_texts_by_ids(
+                session, [recording.text_id for recording in recordings], summary=True
+            ),
             "text_id": text_id,
             "validated_only": validated_only,
             "total_duration": total_duration,
+            "first_page_url": first_page_url(request, cursor),
+            "next_url": next_page_url(request, recordings),
         }
     )
 
@@ -101,39 +124,53 @@ async def record_page(
 @router.post("/", response_class=JSONResponse)
 async def create_recording(
     text_id: int = Form(...),
-    base64_audio: str = Form(...),
+    audio_file: Optional[UploadFile] = File(None),
+    base64_audio: Optional[str] = Form(None),
     notes: Optional[str] = Form(None),
     session: Session = Depends(get_session),
-    settings: Settings = Depends(get_settings),
 ):
     """
-    Create a new recording from Base64 WAV audio.
+    Create a new recording from a WAV upload.
 
     Form parameters:
     - text_id: Associated text ID
-    - base64_audio: Base64-encoded WAV audio data
+    - audio_file: WAV audio file (multipart upload)
+    - base64_audio: Base64-encoded WAV audio data (used if audio_file is absent)
     - notes: Optional notes
 
     Returns:
         JSON response with recording details
     """
-    try:
-        # Verify text exists
-        text = TextService.get_text(session=session, text_id=text_id)
-        if not text:
-            raise HTTPException(status_code=404, detail="Text not found")
+    if audio_file is None and not base64_audio:
+        raise HTTPException(status_code=400, detail="No audio data provided")
+
+    # Decode once at the boundary; the services only handle raw WAV bytes
+    if audio_file is not None:
+        audio_bytes = await audio_file.read()
+    else:
+        try:
+            audio_bytes = base64.b64decode(base64_audio)
+        except binascii.Error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid Base64 audio data: {e}")
 
+    # Verify text exists (outside the try so the 404 is not turned into a 500)
+    text = TextService.get_text(session=session, text_id=text_id)
+    if not text:
+        raise HTTPException(status_code=404, detail="Text not found")
+
+    try:
         # Create recording data
         recording_data = RecordingCreate(
             text_id=text_id,
             notes=notes,
         )
 
-        # Create recording with audio file
-        new_recording = RecordingService.create_recording(
+        # Create recording with audio file (decode and disk write run off the event loop)
+        new_recording = await asyncio.to_thread(
+            RecordingService.create_recording,
             session=session,
             recording_data=recording_data,
-            base64_audio=base64_audio,
+            audio_bytes=audio_bytes,
             settings=settings,
         )
 
@@ -152,6 +189,8 @@ async def create_recording(
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Recording failed: {str(e)}")
 
@@ -188,12 +227,13 @@ async def delete_recording(
     request: Request,
     recording_id: int,
     session: Session = Depends(get_session),
-    settings: Settings = Depends(get_settings),
 ):
     """Delete a recording."""
     templates = get_templates(request)
 
-    success = RecordingService.delete_recording(
+    # Audio file removal runs off the event loop
+    success = await asyncio.to_thread(
+        RecordingService.delete_recording,
         session=session,
         recording_id=recording_id,
         settings=settings,
@@ -203,7 +243,7 @@ async def delete_recording(
         raise HTTPException(status_code=404, detail="Recording not found")
 
     # Return updated recording list
-    recordings = RecordingService.get_recordings(session=session)
+    recordings = RecordingService.get_recordings(session=session, summary=True)
 
     # Calculate total duration
     total_duration = sum(recording.duration for recording in recordings)
@@ -213,6 +253,9 @@ async def delete_recording(
         {
             "request": request,
             "recordings": recordings,
+            "texts_by_id": TextService.get_texts_by_ids(
+                session, [recording.text_id for recording in recordings], summary=True
+            ),
             "message": "録音を削除しました",
             "total_duration": total_duration,
         }
@@ -241,7 +284,7 @@ async def validate_recording(
         raise HTTPException(status_code=404, detail="Recording not found")
 
     # Return updated recording list
-    recordings = RecordingService.get_recordings(session=session)
+    recordings = RecordingService.get_recordings(session=session, summary=True)
 
     # Calculate total duration
     total_duration = sum(recording.duration for recording in recordings)
@@ -252,6 +295,9 @@ async def validate_recording(
         {
             "request": request,
             "recordings": recordings,
+            "texts_by_id": TextService.get_texts_by_ids(
+                session, [recording.text_id for recording in recordings], summary=True
+            ),
             "message": f"録音を{status_text}にマークしました",
             "total_duration": total_duration,
         }
@@ -2,13 +2,22 @@
 Text management API routes.
 """
 
+import hashlib
+from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Request, Form, HTTPException, Depends
+from fastapi import APIRouter, Request, Form, HTTPException, Depends, Response
 from fastapi.responses import HTMLResponse
 from sqlmodel import Session
 
+from webapp.config import settings
 from webapp.database import get_session
+from webapp.pagination import (
+    PAGE_SIZE,
+    first_page_url,
+    keyset_cursor,
+    next_page_url,
+)
 from webapp.services.text_service import TextService
 from webapp.models.text import Text, TextCreate, TextUpdate
 
@@ -21,11 +30,26 @@ def get_templates(request: Request):
     return request.app.state.templates
 
 
+def _make_etag(*parts) -> str:
+    """Build a weak ETag from the given parts (and the app version)."""
+    key = "|".join(str(part) for part in (settings.APP_VERSION, *parts))
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"'
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client's cached copy matches etag."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
 @router.get("/", response_class=HTMLResponse)
 async def list_texts(
     request: Request,
     language: Optional[str] = None,
     source: Optional[str] = None,
+    after_created: Optional[datetime] = None,
+    after_id: Optional[int] = None,
     session: Session = Depends(get_session),
 ):
     """
@@ -34,14 +58,34 @@ async def list_texts(
     Query parameters:
     - language: Filter by language code (e.g., 'ja')
     - source: Filter by source ('manual', 'llm_generated', 'imported')
+    - after_created, after_id: Keyset cursor of the previous page's last row
     """
     templates = get_templates(request)
 
-    # Get filtered texts
+    # Treat empty query values (?language=) as "no filter"
+    language = language or None
+    source = source or None
+
+    # Revalidation: skip the list query and render if nothing changed
+    latest_update, count = TextService.get_texts_version(
+        session=session,
+        language=language,
+        source=source,
+    )
+    cursor = keyset_cursor(after_created, after_id)
+    etag = _make_etag(latest_update, count, language, source, cursor)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
+    # Get filtered texts (only the columns the list shows)
     texts = TextService.get_texts(
         session=session,
+        limit=PAGE_SIZE,
         language=language,
         source=source,
+        after=cursor,
+        summary=True,
     )
 
     return templates.TemplateResponse(
@@ -51,7 +95,10 @@ async def list_texts(
             "texts": texts,
             "language": language,
             "source": source,
-        }
+            "first_page_url": first_page_url(request, cursor),
+            "next_url": next_page_url(request, texts),
+        },
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
     )
 
 
@@ -83,7 +130,7 @@ async def create_text(
     """
     Create a new text entry.
 
-    Returns the updated text list (HTMX partial).
+    Returns a confirmation message (HTMX partial) for the form page.
     """
     templates = get_templates(request)
 
@@ -103,16 +150,13 @@ async def create_text(
             text_data=text_data,
         )
 
-        # Return updated text list
-        texts = TextService.get_texts(session=session)
-
         return templates.TemplateResponse(
-            "texts/list.html",
+            "texts/_message.html",
             {
                 "request": request,
-                "texts": texts,
                 "message": f"テキスト「{new_text.content[:20]}...」を追加しました",
-            }
+            },
+            headers={"HX-Trigger": "text-created"},
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -132,12 +176,18 @@ async def get_text(
     if not text:
         raise HTTPException(status_code=404, detail="Text not found")
 
+    etag = _make_etag(text.id, text.updated_at)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
     return templates.TemplateResponse(
         "texts/detail.html",
         {
             "request": request,
             "text": text,
-        }
+        },
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
     )
 
 
@@ -194,16 +244,13 @@ async def update_text(
         if not updated_text:
             raise HTTPException(status_code=404, detail="Text not found")
 
-        # Return updated text list
-        texts = TextService.get_texts(session=session)
-
         return templates.TemplateResponse(
-            "texts/list.html",
+            "texts/_message.html",
             {
                 "request": request,
-                "texts": texts,
-                "message": f"テキストを更新しました",
-            }
+                "message": "テキストを更新しました",
+            },
+            headers={"HX-Trigger": "text-updated"},
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -215,22 +262,18 @@ async def delete_text(
     text_id: int,
     session: Session = Depends(get_session),
 ):
-    """Delete a text entry."""
-    templates = get_templates(request)
+    """
+    Delete a text entry.
 
+    From the list, the row is removed client-side (hx-swap="delete");
+    from any other page, the browser is redirected to the list.
+    """
     success = TextService.delete_text(session=session, text_id=text_id)
 
     if not success:
         raise HTTPException(status_code=404, detail="Text not found")
 
-    # Return updated text list
-    texts = TextService.get_texts(session=session)
+    if request.headers.get("HX-Target") == f"text-row-{text_id}":
+        return HTMLResponse(content="", status_code=200)
 
-    return templates.TemplateResponse(
-        "texts/list.html",
-        {
-            "request": request,
-            "texts": texts,
-            "message": "テキストを削除しました",
-        }
-    )
+    return HTMLResponse(content="", status_code=200, headers={"HX-Redirect": "/texts/"})
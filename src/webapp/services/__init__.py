@@ -4,10 +4,12 @@ from .text_service import TextService
 from .audio_service import AudioService
 from .recording_service import RecordingService
 from .export_service import ExportService
+from .dashboard_service import DashboardService
 
 __all__ = [
     "TextService",
     "AudioService",
     "RecordingService",
     "ExportService",
+    "DashboardService",
 ]
@@ -2,12 +2,15 @@
 
 import base64
 import io
+import wave
 from datetime import datetime
+from math import gcd
 from pathlib import Path
 from typing import Optional
 
-import librosa
+import numpy as np
 import soundfile as sf
+from scipy.signal import resample_poly
 
 from webapp.config import Settings
 
@@ -15,20 +18,84 @@ from webapp.config import Settings
 class AudioService:
     """Service for audio file operations."""
 
+    @staticmethod
+    def _read_pcm16_wav(audio_bytes: bytes) -> Optional[tuple[np.ndarray, int]]:
+        """Decode a 16-bit PCM WAV by viewing its data chunk as int16.
+
+        This is the format the browser recorder uploads; anything else
+        returns None so the caller can fall back to soundfile.
+
+        Args:
+            audio_bytes: WAV file contents
+
+        Returns:
+            Tuple of (float32 samples shaped (frames,) or (frames, channels),
+            sample_rate), or None if the data is not 16-bit PCM WAV
+        """
+        try:
+            with wave.open(io.BytesIO(audio_bytes)) as wav:
+                if wav.getsampwidth() != 2:
+                    return None
+                channels = wav.getnchannels()
+                sample_rate = wav.getframerate()
+                frames = wav.readframes(wav.getnframes())
+        except (wave.Error, EOFError):
+            return None
+
+        samples = np.frombuffer(frames, dtype="<i2")
+        audio_data = samples.astype(np.float32) * (1.0 / 32768.0)
+        if channels > 1:
+            audio_data = audio_data.reshape(-1, channels)
+        return audio_data, sample_rate
+
+    @staticmethod
+    def make_timestamp() -> str:
+        """Get the current time formatted for recording filenames.
+
+        Returns:
+            Timestamp string (YYYYmmdd_HHMMSS_ffffff)
+        """
+        return datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+    @staticmethod
+    def make_filename(
+        timestamp: str,
+        text_id: Optional[int] = None,
+        recording_id: Optional[int] = None,
+    ) -> str:
+        """Build a recording filename.
+
+        Args:
+            timestamp: Timestamp from make_timestamp
+            text_id: Associated text ID (used until the recording ID is known)
+            recording_id: Recording ID (if available)
+
+        Returns:
+            Filename rec_{recording_id}_{timestamp}.wav, or
+            rec_text{text_id}_{timestamp}.wav without a recording ID
+        """
+        if recording_id:
+            return f"rec_{recording_id}_{timestamp}.wav"
+        return f"rec_text{text_id}_{timestamp}.wav"
+
     @staticmethod
     def save_audio(
-        base64_audio: str,
+        base64_audio: Optional[str],
         text_id: int,
         settings: Settings,
         recording_id: Optional[int] = None,
+        audio_bytes: Optional[bytes] = None,
+        timestamp: Optional[str] = None,
     ) -> tuple[Path, float, int]:
-        """Save Base64-encoded WAV audio to file.
+        """Save WAV audio (raw bytes or Base64-encoded) to file.
 
         Args:
-            base64_audio: Base64-encoded WAV audio data
+            base64_audio: Base64-encoded WAV audio data (ignored if audio_bytes is given)
             text_id: Associated text ID
             settings: Application settings
             recording_id: Recording ID (if available)
+            audio_bytes: Raw WAV audio data (e.g. from a multipart upload)
+            timestamp: Filename timestamp (see make_timestamp); defaults to now
 
         Returns:
             Tuple of (file_path, duration, file_size)
@@ -37,31 +104,44 @@ class AudioService:
             ValueError: If audio data is invalid or too long
         """
         # Decode Base64 audio
-        try:
-            audio_bytes = base64.b64decode(base64_audio)
-        except Exception as e:
-            raise ValueError(f"Invalid Base64 audio data: {e}")
-
-        # Load audio using soundfile
-        try:
-            audio_data, sample_rate = sf.read(io.BytesIO(audio_bytes))
-        except Exception as e:
-            raise ValueError(f"Failed to read audio data: {e}")
-
-        # Resample to target sample rate if needed
+        if audio_bytes is None:
+            try:
+                audio_bytes = base64.b64decode(base64_audio)
+            except Exception as e:
+                raise ValueError(f"Invalid Base64 audio data: {e}")
+
+        # Fast path for 16-bit PCM WAV; other formats go through soundfile
+        decoded = AudioService._read_pcm16_wav(audio_bytes)
+        if decoded is not None:
+            audio_data, sample_rate = decoded
+        else:
+            try:
+                audio_data, sample_rate = sf.read(
+                    io.BytesIO(audio_bytes), dtype="float32"
+                )
+            except Exception as e:
+                raise ValueError(f"Failed to read audio data: {e}")
+
+        # A mono 16-bit PCM WAV already at the target rate is stored unchanged
+        store_original = (
+            decoded is not None
+            and audio_data.ndim == 1
+            and sample_rate == settings.TARGET_SAMPLE_RATE
+        )
+
+        # Convert to mono if stereo (before resampling, so only one channel is filtered)
+        if audio_data.ndim > 1:
+            audio_data = audio_data.mean(axis=1, dtype=np.float32)
+
+        # Resample to target sample rate if needed (polyphase filter)
         target_sample_rate = settings.TARGET_SAMPLE_RATE
         if sample_rate != target_sample_rate:
-            audio_data = librosa.resample(
-                audio_data,
-                orig_sr=sample_rate,
-                target_sr=target_sample_rate,
-            )
+            g = gcd(sample_rate, target_sample_rate)
+            audio_data = resample_poly(
+                audio_data, target_sample_rate // g, sample_rate // g
+            ).astype(np.float32, copy=False)
             sample_rate = target_sample_rate
 
-        # Convert to mono if stereo
-        if len(audio_data.shape) > 1:
-            audio_data = librosa.to_mono(audio_data.T)
-
         # Calculate duration
         duration = len(audio_data) / sample_rate
 
@@ -73,22 +153,24 @@ class AudioService:
             )
 
         # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        if recording_id:
-            filename = f"rec_{recording_id}_{timestamp}.wav"
-        else:
-            filename = f"rec_text{text_id}_{timestamp}.wav"
+        filename = AudioService.make_filename(
+            timestamp or AudioService.make_timestamp(),
+            text_id=text_id,
+            recording_id=recording_id,
+        )
 
         # Ensure audio directory exists
         audio_dir = settings.WEBAPP_AUDIO_DIR
         audio_dir.mkdir(parents=True, exist_ok=True)
 
-        # Save to file
+        # Save to file (re-encode only if downmix/resample changed the data)
         file_path = audio_dir / filename
-        sf.write(file_path, audio_data, sample_rate)
-
-        # Get file size
-        file_size = file_path.stat().st_size
+        if store_original:
+            file_path.write_bytes(audio_bytes)
+            file_size = len(audio_bytes)
+        else:
+            sf.write(file_path, audio_data, sample_rate)
+            file_size = file_path.stat().st_size
 
         return file_path, duration, file_size
 
@@ -124,14 +206,13 @@ class AudioService:
             return None
 
         try:
-            audio_data, sample_rate = sf.read(file_path)
-            duration = len(audio_data) / sample_rate
-            channels = 1 if len(audio_data.shape) == 1 else audio_data.shape[1]
+            # Header only; the PCM data is not decoded
+            info = sf.info(str(file_path))
 
             return {
-                "duration": duration,
-                "sample_rate": sample_rate,
-                "channels": channels,
+                "duration": info.frames / info.samplerate,
+                "sample_rate": info.samplerate,
+                "channels": info.channels,
                 "file_size": file_path.stat().st_size,
             }
         except Exception:
@@ -0,0 +1,48 @@
+"""Service for dashboard statistics."""
+
+import time
+
+from sqlmodel import Session, select, func
+
+from webapp.models.dataset import DatasetExport
+from webapp.models.recording import Recording
+from webapp.models.text import Text
+
+
+class DashboardService:
+    """Service for dashboard aggregate queries."""
+
+    # Seconds to reuse counts across dashboard refreshes (per process: each
+    # uvicorn worker may show counts up to COUNTS_TTL seconds stale)
+    COUNTS_TTL = 5.0
+
+    # (expires_at, (text_count, recording_count, export_count))
+    _counts_cache: tuple[float, tuple[int, int, int]] | None = None
+
+    @staticmethod
+    def counts(session: Session) -> tuple[int, int, int]:
+        """Count texts, recordings and exports in a single query.
+
+        Results are cached in-process for COUNTS_TTL seconds.
+
+        Args:
+            session: Database session
+
+        Returns:
+            Tuple of (text_count, recording_count, export_count)
+        """
+        now = time.monotonic()
+        cached = DashboardService._counts_cache
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        statement = select(
+            select(func.count()).select_from(Text).scalar_subquery(),
+            select(func.count()).select_from(Recording).scalar_subquery(),
+            select(func.count()).select_from(DatasetExport).scalar_subquery(),
+        )
+        text_count, recording_count, export_count = session.exec(statement).one()
+
+        counts = (text_count, recording_count, export_count)
+        DashboardService._counts_cache = (now + DashboardService.COUNTS_TTL, counts)
+        return counts
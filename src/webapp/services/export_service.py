@@ -1,21 +1,42 @@
 """Service for exporting datasets to Common Voice format."""
 
-import random
+import os
+import uuid
+from collections.abc import Iterable, Iterator
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-from sqlmodel import Session, select
+import numpy as np
+from loguru import logger
+from sqlalchemy import update
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, func, select
 
 from finetune_whisper.data.formats import (
     create_common_voice_tsv,
     validate_common_voice_format,
 )
 from webapp.config import Settings
+from webapp.database import engine
 from webapp.models.dataset import DatasetExport, DatasetExportCreate
 from webapp.models.recording import Recording
 
 
+# Recordings loaded per database round trip while streaming an export
+EXPORT_CHUNK_SIZE = 1000
+
+# IDs per "id IN (...)" query (stays well under SQLite's bound-parameter limit)
+EXPORT_ID_BATCH_SIZE = 500
+
+
+@lru_cache(maxsize=None)
+def _exports_prefix(exports_dir: Path, data_dir: Path) -> str:
+    """Exports directory relative to the data directory (settings are immutable)."""
+    return exports_dir.relative_to(data_dir).as_posix()
+
+
 class ExportService:
     """Service for dataset export operations."""
 
@@ -39,16 +60,18 @@ class ExportService:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         export_name = export_data.name.replace(" ", "_").lower()
         export_dir_name = f"{export_name}_{timestamp}"
-        export_path = settings.WEBAPP_EXPORTS_DIR / export_dir_name
 
-        # Get relative path
-        relative_path = export_path.relative_to(settings.WEBAPP_DATA_DIR)
+        # Path relative to WEBAPP_DATA_DIR
+        exports_prefix = _exports_prefix(
+            settings.WEBAPP_EXPORTS_DIR, settings.WEBAPP_DATA_DIR
+        )
+        relative_path = f"{exports_prefix}/{export_dir_name}"
 
         # Create database entry
         db_export = DatasetExport(
             name=export_data.name,
             description=export_data.description,
-            export_path=str(relative_path),
+            export_path=relative_path,
             total_recordings=0,
             train_count=0,
             dev_count=0,
@@ -93,9 +116,13 @@ class ExportService:
             raise ValueError(f"Export {export_id} not found")
 
         try:
-            # Update status
-            db_export.status = "processing"
-            session.add(db_export)
+            # Mark as processing (short standalone UPDATE so pollers see it);
+            # everything else is written in the single terminal commit
+            session.connection().execute(
+                update(DatasetExport)
+                .where(DatasetExport.id == export_id)
+                .values(status="processing")
+            )
             session.commit()
 
             # Get export directory
@@ -106,74 +133,91 @@ class ExportService:
             clips_dir = export_path / "clips"
             clips_dir.mkdir(exist_ok=True)
 
-            # Query recordings with filters
-            recordings = ExportService._query_recordings(session, db_export)
+            # Count matching recordings (rows are streamed per split below)
+            total = ExportService._count_recordings(session, db_export)
 
-            if len(recordings) == 0:
+            if total == 0:
                 raise ValueError("No recordings found matching the filter criteria")
 
             # Split recordings into train/dev/test
-            train_recs, dev_recs, test_recs = ExportService._split_recordings(
-                recordings,
+            split_sizes = ExportService._split_sizes(
+                total,
                 db_export.train_ratio,
                 db_export.dev_ratio,
-                db_export.test_ratio,
-                db_export.split_strategy,
+            )
+            train_recs, dev_recs, test_recs = ExportService._split_recordings(
+                session,
+                db_export,
+                split_sizes,
             )
 
             # Create TSV files for each split
-            ExportService._create_tsv_for_split(train_recs, export_path / "train.tsv", clips_dir, settings)
-            ExportService._create_tsv_for_split(dev_recs, export_path / "dev.tsv", clips_dir, settings)
-            ExportService._create_tsv_for_split(test_recs, export_path / "test.tsv", clips_dir, settings)
+            train_count = ExportService._create_tsv_for_split(train_recs, export_path / "train.tsv", clips_dir, settings)
+            dev_count = ExportService._create_tsv_for_split(dev_recs, export_path / "dev.tsv", clips_dir, settings)
+            test_count = ExportService._create_tsv_for_split(test_recs, export_path / "test.tsv", clips_dir, settings)
 
-            # Validate dataset format
-            is_valid, errors = validate_common_voice_format(export_path)
-            if not is_valid:
-                raise ValueError(f"Dataset validation failed: {errors}")
+            # Rows are validated while the TSVs are built; the full re-read
+            # of the export is only done in debug mode
+            if settings.DEBUG:
+                is_valid, errors = validate_common_voice_format(export_path)
+                if not is_valid:
+                    raise ValueError(f"Dataset validation failed: {errors}")
 
             # Update export statistics
-            db_export.total_recordings = len(recordings)
-            db_export.train_count = len(train_recs)
-            db_export.dev_count = len(dev_recs)
-            db_export.test_count = len(test_recs)
+            db_export.total_recordings = train_count + dev_count + test_count
+            db_export.train_count = train_count
+            db_export.dev_count = dev_count
+            db_export.test_count = test_count
             db_export.status = "completed"
             db_export.completed_at = datetime.now()
             db_export.error_message = None
 
-            session.add(db_export)
-            session.commit()
-
-            # Update 'latest' symlink
+            # Update 'latest' symlink before the commit, so a failure here
+            # is still recorded as 'failed'
             ExportService._update_latest_symlink(export_path, settings)
 
-            session.refresh(db_export)
+            session.add(db_export)
+            session.commit()
             return db_export
 
         except Exception as e:
-            # Update status on error
+            # Discard any partial state, then record the failure
+            session.rollback()
             db_export.status = "failed"
             db_export.error_message = str(e)
             session.add(db_export)
             session.commit()
-            session.refresh(db_export)
             raise
 
     @staticmethod
-    def _query_recordings(
-        session: Session,
-        export: DatasetExport,
-    ) -> list[Recording]:
-        """Query recordings based on export filters.
+    def run_export(export_id: int, settings: Settings) -> None:
+        """Execute an export in its own database session.
+
+        Intended for background tasks, which outlive the request-scoped
+        session. Failures are recorded on the export (status='failed').
 
         Args:
-            session: Database session
+            export_id: Export ID
+            settings: Application settings
+        """
+        with Session(engine) as session:
+            try:
+                db_export = ExportService.execute_export(session, export_id, settings)
+                logger.info(f"Export {db_export.id} completed successfully")
+            except Exception as e:
+                logger.exception(f"Export {export_id} failed: {e}")
+
+    @staticmethod
+    def _apply_filters(statement, export: DatasetExport):
+        """Apply export filters to a recording query.
+
+        Args:
+            statement: SELECT statement over Recording
             export: DatasetExport instance with filter criteria
 
         Returns:
-            List of Recording instances
+            Filtered statement
         """
-        statement = select(Recording)
-
         # Filter by validation status
         if export.validated_only:
             statement = statement.where(Recording.is_validated == True)
@@ -184,77 +228,187 @@ class ExportService:
         if export.max_duration is not None:
             statement = statement.where(Recording.duration <= export.max_duration)
 
-        # Order by creation time for chronological split
-        statement = statement.order_by(Recording.created_at.asc())
+        return statement
 
-        return list(session.exec(statement).all())
+    @staticmethod
+    def _count_recordings(session: Session, export: DatasetExport) -> int:
+        """Count recordings matching the export filters.
+
+        Args:
+            session: Database session
+            export: DatasetExport instance with filter criteria
+
+        Returns:
+            Number of matching recordings
+        """
+        statement = select(func.count()).select_from(Recording)
+        statement = ExportService._apply_filters(statement, export)
+        return session.exec(statement).one()
 
     @staticmethod
-    def _split_recordings(
-        recordings: list[Recording],
+    def _split_sizes(
+        total: int,
         train_ratio: float,
         dev_ratio: float,
-        test_ratio: float,
-        strategy: str,
-    ) -> tuple[list[Recording], list[Recording], list[Recording]]:
-        """Split recordings into train/dev/test sets.
+    ) -> tuple[int, int, int]:
+        """Compute train/dev/test sizes.
 
         Args:
-            recordings: List of recordings
+            total: Number of recordings
             train_ratio: Training set ratio (e.g., 80.0)
             dev_ratio: Dev set ratio (e.g., 10.0)
-            test_ratio: Test set ratio (e.g., 10.0)
-            strategy: Split strategy ('random' or 'chronological')
 
         Returns:
-            Tuple of (train_recordings, dev_recordings, test_recordings)
+            Tuple of (train_size, dev_size, test_size)
         """
-        total = len(recordings)
-
-        # Calculate split sizes
         train_size = int(total * train_ratio / 100)
         dev_size = int(total * dev_ratio / 100)
         test_size = total - train_size - dev_size  # Remainder goes to test
+        return train_size, dev_size, test_size
+
+    @staticmethod
+    def _split_recordings(
+        session: Session,
+        export: DatasetExport,
+        split_sizes: tuple[int, int, int],
+    ) -> tuple[Iterator[Recording], Iterator[Recording], Iterator[Recording]]:
+        """Split recordings into train/dev/test streams.
+
+        Chronological splits are three LIMIT/OFFSET range queries over the
+        created_at order. Random splits permute an int64 array of recording
+        IDs (seeded by the export ID, so re-running an export reproduces its
+        split) and load the rows of each split in batches. Nothing is queried
+        until a stream is consumed; consume them one after another.
+
+        Args:
+            session: Database session
+            export: DatasetExport instance with filter criteria and strategy
+            split_sizes: Tuple of (train_size, dev_size, test_size)
+
+        Returns:
+            Tuple of (train_recordings, dev_recordings, test_recordings)
+        """
+        train_size, dev_size, test_size = split_sizes
+        bounds = (
+            (0, train_size),
+            (train_size, dev_size),
+            (train_size + dev_size, test_size),
+        )
+
+        if export.split_strategy == "random":
+            statement = ExportService._apply_filters(select(Recording.id), export)
+            recording_ids = np.fromiter(
+                session.exec(statement.order_by(Recording.id)), dtype=np.int64
+            )
+            recording_ids = np.random.default_rng(export.id).permutation(recording_ids)
+            return tuple(
+                ExportService._iter_recordings_by_id(
+                    session, recording_ids[offset : offset + size].tolist()
+                )
+                for offset, size in bounds
+            )
+
+        # Chronological: ordered by created_at
+        return tuple(
+            ExportService._iter_recordings_range(session, export, offset, size)
+            for offset, size in bounds
+        )
+
+    @staticmethod
+    def _iter_recordings_range(
+        session: Session,
+        export: DatasetExport,
+        offset: int,
+        limit: int,
+    ) -> Iterator[Recording]:
+        """Stream a created_at-ordered slice of the matching recordings.
+
+        Args:
+            session: Database session
+            export: DatasetExport instance with filter criteria
+            offset: Number of recordings to skip
+            limit: Number of recordings to return
+
+        Yields:
+            Recording instances (with their Text loaded)
+        """
+        if limit <= 0:
+            return
 
-        # Shuffle if random strategy
-        if strategy == "random":
-            recordings_copy = recordings.copy()
-            random.shuffle(recordings_copy)
-        else:
-            # Chronological: already ordered by created_at
-            recordings_copy = recordings
+        # Load each recording's Text in one IN query per chunk (read for every TSV row)
+        statement = select(Recording).options(selectinload(Recording.text))
+        statement = ExportService._apply_filters(statement, export)
+        statement = (
+            statement.order_by(Recording.created_at.asc(), Recording.id.asc())
+            .offset(offset)
+            .limit(limit)
+            .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        yield from session.exec(statement)
 
-        # Split
-        train_recs = recordings_copy[:train_size]
-        dev_recs = recordings_copy[train_size : train_size + dev_size]
-        test_recs = recordings_copy[train_size + dev_size :]
+    @staticmethod
+    def _iter_recordings_by_id(
+        session: Session,
+        recording_ids: list[int],
+    ) -> Iterator[Recording]:
+        """Stream recordings in the given ID order, loading them in batches.
+
+        Args:
+            session: Database session
+            recording_ids: Recording IDs in output order
 
-        return train_recs, dev_recs, test_recs
+        Yields:
+            Recording instances (with their Text loaded)
+        """
+        for start in range(0, len(recording_ids), EXPORT_ID_BATCH_SIZE):
+            chunk = recording_ids[start : start + EXPORT_ID_BATCH_SIZE]
+            statement = (
+                select(Recording)
+                .options(selectinload(Recording.text))
+                .where(Recording.id.in_(chunk))
+            )
+            by_id = {rec.id: rec for rec in session.exec(statement)}
+            for recording_id in chunk:
+                if recording_id in by_id:
+                    yield by_id[recording_id]
 
     @staticmethod
     def _create_tsv_for_split(
-        recordings: list[Recording],
+        recordings: Iterable[Recording],
         output_path: Path,
         clips_dir: Path,
         settings: Settings,
-    ) -> None:
+    ) -> int:
         """Create TSV file for a split using Common Voice format.
 
         Args:
-            recordings: List of recordings
+            recordings: Recordings of the split (consumed once)
             output_path: Output TSV file path
             clips_dir: Directory to copy audio clips
             settings: Application settings
+
+        Returns:
+            Number of recordings written
+
+        Raises:
+            ValueError: If a recording has no sentence or its audio file is missing
         """
-        # Convert recordings to format expected by create_common_voice_tsv
+        # Convert recordings to format expected by create_common_voice_tsv,
+        # validating each row as it is built
         recordings_data = []
         for rec in recordings:
             audio_path = settings.WEBAPP_DATA_DIR / rec.file_path
+            sentence = rec.text.content.strip() if rec.text else ""
+            if not sentence:
+                raise ValueError(f"Recording {rec.id} has no sentence")
+            if not audio_path.is_file():
+                raise ValueError(f"Audio file not found for recording {rec.id}: {rec.file_path}")
+
             recordings_data.append(
                 {
                     "audio_path": str(audio_path),
-                    "sentence": rec.text.content if rec.text else "",
-                    "locale": rec.text.language if rec.text else "ja",
+                    "sentence": rec.text.content,
+                    "locale": rec.text.language,
                     "client_id": "webapp_user",
                 }
             )
@@ -266,6 +420,8 @@ class ExportService:
             clips_dir=clips_dir,
         )
 
+        return len(recordings_data)
+
     @staticmethod
     def _update_latest_symlink(export_path: Path, settings: Settings) -> None:
         """Update 'latest' symlink to point to the new export.
@@ -276,12 +432,17 @@ class ExportService:
         """
         latest_link = settings.WEBAPP_EXPORTS_DIR / "latest"
 
-        # Remove existing symlink if it exists
-        if latest_link.exists() or latest_link.is_symlink():
-            latest_link.unlink()
-
-        # Create new symlink
-        latest_link.symlink_to(export_path.name)
+        # Create the new symlink under a temporary name, then rename it over
+        # 'latest' so readers never see the link missing. The name is unique per
+        # call: exports finishing together in the same process (threadpool)
+        # must not share a temporary link.
+        tmp_link = latest_link.with_name(f"latest.{uuid.uuid4().hex}.tmp")
+        tmp_link.symlink_to(export_path.name)
+        try:
+            os.replace(tmp_link, latest_link)
+        except OSError:
+            tmp_link.unlink(missing_ok=True)
+            raise
 
     @staticmethod
     def get_export(session: Session, export_id: int) -> Optional[DatasetExport]:
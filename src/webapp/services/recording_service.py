@@ -1,24 +1,59 @@
 """Service for managing Recording entries."""
 
+import os
+import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-from sqlmodel import Session, select
+from loguru import logger
+from sqlalchemy import tuple_, update
+from sqlmodel import Session, func, select
 
 from webapp.config import Settings
 from webapp.models.recording import Recording, RecordingCreate, RecordingUpdate
 from webapp.services.audio_service import AudioService
 
 
+
+@lru_cache(maxsize=4096)
+def _absolute_path(data_dir: Path, relative_path: str) -> Path:
+    """Join a stored relative file path onto the data directory (memoized)."""
+    return data_dir / relative_path
+
+
 class RecordingService:
     """Service for Recording CRUD operations."""
 
+    # Seconds to reuse count results. Writes clear only this process's cache:
+    # with several uvicorn workers, other workers may serve counts up to
+    # COUNT_TTL seconds stale.
+    COUNT_TTL = 30.0
+
+    # {(text_id, validated_only): (expires_at, count)}
+    _count_cache: dict[tuple, tuple[float, int]] = {}
+
+    # Columns loaded for list views (get_recordings(summary=True))
+    SUMMARY_COLUMNS = (
+        Recording.id,
+        Recording.text_id,
+        Recording.duration,
+        Recording.file_size,
+        Recording.is_validated,
+        Recording.created_at,
+    )
+
+    @staticmethod
+    def _invalidate_counts() -> None:
+        """Drop cached counts after a write."""
+        RecordingService._count_cache.clear()
+
     @staticmethod
     def create_recording(
         session: Session,
         recording_data: RecordingCreate,
-        base64_audio: str,
+        audio_bytes: bytes,
         settings: Settings,
     ) -> Recording:
         """Create a new recording with audio file.
@@ -26,7 +61,7 @@ class RecordingService:
         Args:
             session: Database session
             recording_data: Recording creation data
-            base64_audio: Base64-encoded WAV audio data
+            audio_bytes: Raw WAV audio data (already Base64-decoded)
             settings: Application settings
 
         Returns:
@@ -35,50 +70,53 @@ class RecordingService:
         Raises:
             ValueError: If audio data is invalid
         """
-        # Save audio file
+        # Save audio file (decoded and written once); the timestamp is kept so
+        # the file can be renamed once the recording ID is known
+        timestamp = AudioService.make_timestamp()
         file_path, duration, file_size = AudioService.save_audio(
-            base64_audio=base64_audio,
-            text_id=recording_data.text_id,
-            settings=settings,
-        )
-
-        # Get relative path
-        relative_path = AudioService.get_relative_path(file_path, settings)
-
-        # Create recording in database
-        db_recording = Recording(
-            text_id=recording_data.text_id,
-            filename=file_path.name,
-            file_path=relative_path,
-            file_size=file_size,
-            duration=duration,
-            sample_rate=settings.TARGET_SAMPLE_RATE,
-            channels=1,
-            format="wav",
-            is_validated=False,
-            notes=recording_data.notes,
-        )
-
-        session.add(db_recording)
-        session.commit()
-        session.refresh(db_recording)
-
-        # Update filename with recording ID
-        new_file_path, duration, file_size = AudioService.save_audio(
-            base64_audio=base64_audio,
+            base64_audio=None,
             text_id=recording_data.text_id,
             settings=settings,
-            recording_id=db_recording.id,
+            audio_bytes=audio_bytes,
+            timestamp=timestamp,
         )
 
-        # Delete old file
-        AudioService.delete_audio(file_path)
-
-        # Update recording with new filename
-        db_recording.filename = new_file_path.name
-        db_recording.file_path = AudioService.get_relative_path(new_file_path, settings)
-        session.add(db_recording)
-        session.commit()
+        # Both names live in the same directory, so resolve it once
+        relative_dir = AudioService.get_relative_path(file_path.parent, settings)
+
+        try:
+            # Create recording in database
+            db_recording = Recording(
+                text_id=recording_data.text_id,
+                filename=file_path.name,
+                file_path=os.path.join(relative_dir, file_path.name),
+                file_size=file_size,
+                duration=duration,
+                sample_rate=settings.TARGET_SAMPLE_RATE,
+                channels=1,
+                format="wav",
+                is_validated=False,
+                notes=recording_data.notes,
+            )
+            session.add(db_recording)
+            session.flush()  # assigns db_recording.id
+
+            # Rename rec_text{text_id}_{timestamp}.wav -> rec_{id}_{timestamp}.wav
+            new_file_path = file_path.with_name(
+                AudioService.make_filename(timestamp, recording_id=db_recording.id)
+            )
+            file_path.replace(new_file_path)
+            file_path = new_file_path
+
+            db_recording.filename = file_path.name
+            db_recording.file_path = os.path.join(relative_dir, file_path.name)
+            session.commit()
+        except Exception:
+            session.rollback()
+            AudioService.delete_audio(file_path)
+            raise
+
+        RecordingService._invalidate_counts()
         session.refresh(db_recording)
 
         return db_recording
@@ -103,6 +141,8 @@ class RecordingService:
         limit: int = 100,
         text_id: Optional[int] = None,
         validated_only: bool = False,
+        after: Optional[tuple[datetime, int]] = None,
+        summary: bool = False,
     ) -> list[Recording]:
         """Get list of recordings with optional filters.
 
@@ -112,18 +152,34 @@ class RecordingService:
             limit: Maximum number of records to return
             text_id: Filter by text ID
             validated_only: Only return validated recordings
+            after: Keyset cursor (created_at, id) of the last row of the previous
+                page; when given, skip is ignored
+            summary: Load only the columns shown in the recording list
+                (SUMMARY_COLUMNS) as lightweight rows instead of full instances
 
         Returns:
-            List of Recording instances
+            List of Recording instances (or summary rows), newest first (the last
+            row's (created_at, id) is the cursor for the next page)
         """
-        statement = select(Recording)
+        if summary:
+            statement = select(*RecordingService.SUMMARY_COLUMNS)
+        else:
+            statement = select(Recording)
 
-        if text_id:
+        if text_id is not None:
             statement = statement.where(Recording.text_id == text_id)
         if validated_only:
             statement = statement.where(Recording.is_validated == True)
 
-        statement = statement.offset(skip).limit(limit).order_by(Recording.created_at.desc())
+        if after is not None:
+            # Keyset pagination: O(limit) per page regardless of depth
+            statement = statement.where(tuple_(Recording.created_at, Recording.id) < tuple_(*after))
+        else:
+            statement = statement.offset(skip)
+
+        statement = statement.limit(limit).order_by(
+            Recording.created_at.desc(), Recording.id.desc()
+        )
         return list(session.exec(statement).all())
 
     @staticmethod
@@ -142,19 +198,8 @@ class RecordingService:
         Returns:
             Updated Recording instance if found, None otherwise
         """
-        db_recording = session.get(Recording, recording_id)
-        if not db_recording:
-            return None
-
         update_dict = recording_data.model_dump(exclude_unset=True)
-        for key, value in update_dict.items():
-            setattr(db_recording, key, value)
-
-        db_recording.updated_at = datetime.now()
-        session.add(db_recording)
-        session.commit()
-        session.refresh(db_recording)
-        return db_recording
+        return RecordingService._update_returning(session, recording_id, update_dict)
 
     @staticmethod
     def delete_recording(
@@ -176,13 +221,17 @@ class RecordingService:
         if not db_recording:
             return False
 
-        # Delete audio file
         file_path = settings.WEBAPP_DATA_DIR / db_recording.file_path
-        AudioService.delete_audio(file_path)
 
-        # Delete database entry
+        # Delete database entry first so a failed commit never leaves a row
+        # pointing at a missing file
         session.delete(db_recording)
         session.commit()
+        RecordingService._invalidate_counts()
+
+        # Delete audio file (an orphaned file is harmless, a dangling row is not)
+        if not AudioService.delete_audio(file_path):
+            logger.warning(f"Audio file for recording {recording_id} not removed: {file_path}")
         return True
 
     @staticmethod
@@ -203,18 +252,39 @@ class RecordingService:
         Returns:
             Updated Recording instance if found, None otherwise
         """
-        db_recording = session.get(Recording, recording_id)
-        if not db_recording:
-            return None
-
-        db_recording.is_validated = is_valid
+        values = {"is_validated": is_valid}
         if notes:
-            db_recording.notes = notes
-        db_recording.updated_at = datetime.now()
+            values["notes"] = notes
+        return RecordingService._update_returning(session, recording_id, values)
+
+    @staticmethod
+    def _update_returning(
+        session: Session, recording_id: int, values: dict
+    ) -> Optional[Recording]:
+        """Apply an update in one UPDATE ... RETURNING statement.
 
-        session.add(db_recording)
+        Args:
+            session: Database session
+            recording_id: Recording ID
+            values: Column values to set (updated_at is added)
+
+        Returns:
+            Updated Recording instance if found, None otherwise
+        """
+        statement = (
+            update(Recording)
+            .where(Recording.id == recording_id)
+            .values(**values, updated_at=datetime.now())
+            .returning(Recording)
+        )
+        db_recording = session.scalars(statement).one_or_none()
+        if db_recording is None:
+            return None
+
+        # Detach so the commit does not expire the freshly returned row
+        session.expunge(db_recording)
         session.commit()
-        session.refresh(db_recording)
+        RecordingService._invalidate_counts()
         return db_recording
 
     @staticmethod
@@ -231,16 +301,25 @@ class RecordingService:
             validated_only: Only count validated recordings
 
         Returns:
-            Total count of recordings
+            Total count of recordings (cached per process for up to COUNT_TTL
+            seconds; may lag writes made by other workers)
         """
-        statement = select(Recording)
+        key = (text_id, validated_only)
+        now = time.monotonic()
+        cached = RecordingService._count_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        statement = select(func.count()).select_from(Recording)
 
-        if text_id:
+        if text_id is not None:
             statement = statement.where(Recording.text_id == text_id)
         if validated_only:
             statement = statement.where(Recording.is_validated == True)
 
-        return len(list(session.exec(statement).all()))
+        count = session.exec(statement).one()
+        RecordingService._count_cache[key] = (now + RecordingService.COUNT_TTL, count)
+        return count
 
     @staticmethod
     def get_recording_file_path(recording: Recording, settings: Settings) -> Path:
@@ -253,4 +332,4 @@ class RecordingService:
         Returns:
             Absolute path to recording file
         """
-        return settings.WEBAPP_DATA_DIR / recording.file_path
+        return _absolute_path(settings.WEBAPP_DATA_DIR, recording.file_path)
@@ -3,15 +3,23 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import tuple_, update
 from sqlmodel import Session, select, func
 
 from webapp.models.text import Text, TextCreate, TextUpdate
 from webapp.models.recording import Recording
 
 
+# IDs per "id IN (...)" query (stays well under SQLite's bound-parameter limit)
+ID_BATCH_SIZE = 500
+
+
 class TextService:
     """Service for Text CRUD operations."""
 
+    # Leading content characters loaded for list views (get_texts(summary=True))
+    SUMMARY_CONTENT_CHARS = 51
+
     @staticmethod
     def create_text(session: Session, text_data: TextCreate) -> Text:
         """Create a new text entry.
@@ -42,6 +50,40 @@ class TextService:
         """
         return session.get(Text, text_id)
 
+    @staticmethod
+    def get_texts_by_ids(
+        session: Session, text_ids: list[int], summary: bool = False
+    ) -> dict[int, Text]:
+        """Get text entries for many IDs with batched IN queries.
+
+        Args:
+            session: Database session
+            text_ids: Text IDs (duplicates are ignored)
+            summary: Load only id and content truncated in SQL to
+                SUMMARY_CONTENT_CHARS, as lightweight rows instead of full instances
+
+        Returns:
+            Dictionary mapping text ID to Text instance or summary row (missing IDs
+            are absent)
+        """
+        if summary:
+            columns = (
+                Text.id,
+                func.substr(Text.content, 1, TextService.SUMMARY_CONTENT_CHARS).label(
+                    "content"
+                ),
+            )
+        else:
+            columns = (Text,)
+
+        unique_ids = list(dict.fromkeys(text_ids))
+        texts = {}
+        for start in range(0, len(unique_ids), ID_BATCH_SIZE):
+            batch = unique_ids[start : start + ID_BATCH_SIZE]
+            statement = select(*columns).where(Text.id.in_(batch))
+            texts.update((text.id, text) for text in session.exec(statement))
+        return texts
+
     @staticmethod
     def get_texts(
         session: Session,
@@ -49,6 +91,8 @@ class TextService:
         limit: int = 100,
         language: Optional[str] = None,
         source: Optional[str] = None,
+        after: Optional[tuple[datetime, int]] = None,
+        summary: bool = False,
     ) -> list[Text]:
         """Get list of text entries with optional filters.
 
@@ -58,20 +102,72 @@ class TextService:
             limit: Maximum number of records to return
             language: Filter by language code
             source: Filter by source type
+            after: Keyset cursor (created_at, id) of the last row of the previous
+                page; when given, skip is ignored
+            summary: Load only the columns shown in the text list as lightweight
+                rows, with content truncated in SQL to SUMMARY_CONTENT_CHARS
 
         Returns:
-            List of Text instances
+            List of Text instances (or summary rows), newest first (the last
+            row's (created_at, id) is the cursor for the next page)
         """
-        statement = select(Text)
-
-        if language:
+        if summary:
+            statement = select(
+                Text.id,
+                func.substr(Text.content, 1, TextService.SUMMARY_CONTENT_CHARS).label(
+                    "content"
+                ),
+                Text.description,
+                Text.source,
+                Text.tags,
+                Text.created_at,
+            )
+        else:
+            statement = select(Text)
+
+        if language is not None:
             statement = statement.where(Text.language == language)
-        if source:
+        if source is not None:
             statement = statement.where(Text.source == source)
 
-        statement = statement.offset(skip).limit(limit).order_by(Text.created_at.desc())
+        if after is not None:
+            # Keyset pagination: O(limit) per page regardless of depth
+            statement = statement.where(tuple_(Text.created_at, Text.id) < tuple_(*after))
+        else:
+            statement = statement.offset(skip)
+
+        statement = statement.limit(limit).order_by(
+            Text.created_at.desc(), Text.id.desc()
+        )
         return list(session.exec(statement).all())
 
+    @staticmethod
+    def get_texts_version(
+        session: Session,
+        language: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> tuple[Optional[datetime], int]:
+        """Get a cheap fingerprint of the filtered text list.
+
+        Any insert, update or delete changes the latest update time or the count.
+
+        Args:
+            session: Database session
+            language: Filter by language code
+            source: Filter by source type
+
+        Returns:
+            Tuple of (latest updated_at, row count)
+        """
+        statement = select(func.max(Text.updated_at), func.count()).select_from(Text)
+
+        if language is not None:
+            statement = statement.where(Text.language == language)
+        if source is not None:
+            statement = statement.where(Text.source == source)
+
+        return tuple(session.exec(statement).one())
+
     @staticmethod
     def update_text(
         session: Session, text_id: int, text_data: TextUpdate
@@ -86,18 +182,22 @@ class TextService:
         Returns:
             Updated Text instance if found, None otherwise
         """
-        db_text = session.get(Text, text_id)
-        if not db_text:
-            return None
-
         update_dict = text_data.model_dump(exclude_unset=True)
-        for key, value in update_dict.items():
-            setattr(db_text, key, value)
 
-        db_text.updated_at = datetime.now()
-        session.add(db_text)
+        # Single UPDATE ... RETURNING instead of get + flush + refresh
+        statement = (
+            update(Text)
+            .where(Text.id == text_id)
+            .values(**update_dict, updated_at=datetime.now())
+            .returning(Text)
+        )
+        db_text = session.scalars(statement).one_or_none()
+        if db_text is None:
+            return None
+
+        # Detach so the commit does not expire the freshly returned row
+        session.expunge(db_text)
         session.commit()
-        session.refresh(db_text)
         return db_text
 
     @staticmethod
@@ -119,43 +219,6 @@ class TextService:
         session.commit()
         return True
 
-    @staticmethod
-    def count_texts(session: Session, language: Optional[str] = None) -> int:
-        """Count total number of texts.
-
-        Args:
-            session: Database session
-            language: Optional language filter
-
-        Returns:
-            Total count of texts
-        """
-        statement = select(Text)
-        if language:
-            statement = statement.where(Text.language == language)
-
-        return len(list(session.exec(statement).all()))
-
-    @staticmethod
-    def bulk_create_texts(
-        session: Session, texts_data: list[TextCreate]
-    ) -> list[Text]:
-        """Bulk create text entries.
-
-        Args:
-            session: Database session
-            texts_data: List of text creation data
-
-        Returns:
-            List of created Text instances
-        """
-        db_texts = [Text.model_validate(text_data) for text_data in texts_data]
-        session.add_all(db_texts)
-        session.commit()
-        for db_text in db_texts:
-            session.refresh(db_text)
-        return db_texts
-
     @staticmethod
     def get_texts_without_recordings(
         session: Session,
@@ -174,13 +237,14 @@ class TextService:
         Returns:
             List of Text instances without recordings
         """
-        # Subquery to get text IDs that have recordings
-        recorded_text_ids = select(Recording.text_id).distinct()
+        # Correlated NOT EXISTS: an index probe per text instead of building
+        # the DISTINCT set of recorded text IDs
+        has_recording = select(Recording.id).where(Recording.text_id == Text.id).exists()
 
         # Main query to get texts without recordings
-        statement = select(Text).where(Text.id.not_in(recorded_text_ids))
+        statement = select(Text).where(~has_recording)
 
-        if language:
+        if language is not None:
             statement = statement.where(Text.language == language)
 
         statement = statement.offset(skip).limit(limit).order_by(Text.created_at.desc())
@@ -1,6 +1,6 @@
 /**
  * Web Audio API-based audio recorder
- * Records audio from microphone and uploads to server as Base64 WAV
+ * Records audio from microphone and uploads to server as a WAV file
  */
 
 class AudioRecorder {
@@ -187,34 +187,15 @@ class AudioRecorder {
         }
     }
 
-    /**
-     * Convert Blob to Base64 string
-     */
-    async blobToBase64(blob) {
-        return new Promise((resolve, reject) => {
-            const reader = new FileReader();
-            reader.onloadend = () => {
-                // Remove data URL prefix (e.g., "data:audio/wav;base64,")
-                const base64 = reader.result.split(',')[1];
-                resolve(base64);
-            };
-            reader.onerror = reject;
-            reader.readAsDataURL(blob);
-        });
-    }
-
     /**
      * Upload recording to server
      */
     async uploadToServer(textId, audioBlob) {
         try {
-            // Convert to Base64
-            const base64Audio = await this.blobToBase64(audioBlob);
-
-            // Create form data
+            // Create form data (WAV sent as a multipart file, no Base64 overhead)
             const formData = new FormData();
             formData.append('text_id', textId);
-            formData.append('base64_audio', base64Audio);
+            formData.append('audio_file', audioBlob, 'recording.wav');
 
             // Upload to server
             const response = await fetch('/recordings/', {